@@ -0,0 +1,69 @@
+# scripts/test_encryption.py
+"""加密/解密自测脚本（原 encryption_utils 的 __main__ 示例）"""
+
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.encryption_utils import encrypt, decrypt, EncryptionError, DecryptionError
+
+
+def main():
+    # Example Usage (optional - for testing)
+    # Ensure ENCRYPTION_KEY is set in your .env file or environment for this test to work
+    # from dotenv import load_dotenv
+    # import os
+    # load_dotenv() # Load environment variables from .env file
+    # test_key = os.getenv("ENCRYPTION_KEY")
+
+    # For testing without relying on .env, you can use a placeholder key,
+    # but remember that Config.ENCRYPTION_KEY will be used in the actual application.
+    test_key = "your-super-secret-and-long-enough-passphrase-for-testing"
+
+    if not test_key:
+        print("Please set the ENCRYPTION_KEY environment variable for testing.")
+    else:
+        original_text = "This is a secret message!"
+        print(f"Original: {original_text}")
+
+        try:
+            encrypted = encrypt(original_text, test_key)
+            print(f"Encrypted: {encrypted}")
+
+            decrypted = decrypt(encrypted, test_key)
+            print(f"Decrypted: {decrypted}")
+
+            if decrypted == original_text:
+                print("Encryption and decryption test successful!")
+            else:
+                print("Decryption did not match original text.")
+
+        except EncryptionError as e:
+            print(f"Test Encryption Error: {e}")
+        except DecryptionError as e:
+            print(f"Test Decryption Error: {e}")
+
+        # Test with a wrong key
+        wrong_key = "this-is-a-wrong-key-for-sure123"
+        print("\nTesting decryption with a wrong key...")
+        try:
+            if encrypted:
+                decrypted_with_wrong_key = decrypt(encrypted, wrong_key)
+                print(f"Decrypted with wrong key: {decrypted_with_wrong_key}") # Should be None or raise error
+        except DecryptionError as e:
+            print(f"Caught expected error with wrong key: {e}")
+
+        # Test with invalid encrypted text
+        print("\nTesting decryption with invalid encrypted text...")
+        invalid_encrypted_text = b"invalid_encrypted_text"
+        try:
+            decrypted_invalid_text = decrypt(invalid_encrypted_text, test_key)
+            print(f"Decrypted invalid text: {decrypted_invalid_text}") # Should be None or raise error
+        except DecryptionError as e:
+            print(f"Caught expected error with invalid text: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ from openai import AsyncOpenAI
 
 from src.config import Config
 from src.no_auth_processor import NoAuthCustomAPIProcessor
+from src.http_client import create_api_client
 
 logger = logging.getLogger(__name__)
 
@@ -69,14 +70,7 @@ class AIClientManager:
             api_base_url = config.get("api_base_url")
             timeout = config.get("timeout", 120.0)
             if api_key and api_base_url:
-                return httpx.AsyncClient(
-                    base_url=api_base_url,
-                    headers={
-                        "Authorization": f"Bearer {api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    timeout=timeout,
-                )
+                return create_api_client(api_base_url, api_key, timeout)
 
         elif provider_name == "custom":
             api_base_url = config.get("api_base_url")
@@ -84,14 +78,7 @@ class AIClientManager:
 
             if api_base_url:
                 if require_auth and api_key:
-                    return httpx.AsyncClient(
-                        base_url=api_base_url,
-                        headers={
-                            "Authorization": f"Bearer {api_key}",
-                            "Content-Type": "application/json",
-                        },
-                        timeout=timeout,
-                    )
+                    return create_api_client(api_base_url, api_key, timeout)
                 elif not require_auth:
                     default_model = config.get("default_model", "default")
                     return NoAuthCustomAPIProcessor(
@@ -124,7 +111,7 @@ class AIClientManager:
     async def close_all_clients(self):
         """关闭所有httpx客户端"""
         for client in self.clients.values():
-            if isinstance(client, httpx.AsyncClient):
+            if isinstance(client, (httpx.AsyncClient, NoAuthCustomAPIProcessor)):
                 await client.aclose()
 
         self.clients.clear()
@@ -1,10 +1,9 @@
 # src/ai_services/extraction_service.py
 """数据提取服务 - 封装AI数据提取逻辑"""
 
-import json
 import re
 import logging
-from datetime import datetime
+from datetime import date
 from typing import Dict, Optional, Any
 import httpx
 from openai import AsyncOpenAI
@@ -12,30 +11,193 @@ from openai import AsyncOpenAI
 from src.models.data_models import ProjectStructured, EngineerStructured, EmailData
 from src.ai_services.ai_client_manager import ai_client_manager
 from src.no_auth_processor import NoAuthCustomAPIProcessor
+from src.cache_utils import LRUCache, content_digest
+from src.config import Config
+from src import fast_json
 
 logger = logging.getLogger(__name__)
 
+# JSON片段及日期解析用的正则（模块加载时编译一次）
+_JSON_OBJECT_RE = re.compile(r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}", re.DOTALL)
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_JA_DATE_RE = re.compile(r"(\d{4})年(\d{1,2})月?(?:(\d{1,2})日?)?")
+_NUMERIC_DATE_RE = re.compile(r"(\d{4})[/-](\d{1,2})(?:[/-](\d{1,2}))?")
+_IMMEDIATE_START_WORDS = frozenset(["即日", "即日開始", "すぐ", "今すぐ", "ASAP"])
+
+# 提取类型 → 结果模型（缓存命中时据此重建模型）
+_EXTRACTION_MODELS = {"project": ProjectStructured, "engineer": EngineerStructured}
+
+# 提示词模板（静态部分只在模块加载时构建一次，调用时仅填充件名和本文）
+_PROJECT_PROMPT_TMPL = """
+以下のメールから案件情報を抽出して、必ずJSON形式で返してください。他の説明は不要です。
+
+件名: {subject}
+本文: {body}
+
+以下の形式で抽出してください：
+{{
+    "title": "案件タイトル",
+    "client_company": "クライアント企業名",
+    "partner_company": "パートナー企業名",
+    "description": "案件概要",
+    "detail_description": "詳細説明",
+    "skills": ["必要スキル1", "必要スキル2"],
+    "key_technologies": "主要技術",
+    "location": "勤務地",
+    "work_type": "勤務形態（常駐/リモート/ハイブリッド等）",
+    "start_date": "開始日（YYYY-MM-DD形式、例：2024-06-01）",
+    "duration": "期間",
+    "application_deadline": "応募締切（YYYY-MM-DD形式）",
+    "budget": "予算/単価",
+    "desired_budget": "希望予算",
+    "japanese_level": "日本語レベル",
+    "experience": "必要経験",
+    "foreigner_accepted": true,
+    "freelancer_accepted": true,
+    "interview_count": "1",
+    "processes": ["工程1", "工程2"],
+    "max_candidates": 5,
+    "manager_name": "担当者名",
+    "manager_email": "担当者メール"
+}}
+
+重要：
+- start_dateは必ずYYYY-MM-DD形式で返してください
+- 開始日が即日・すぐ等の場合は現在の日付を使用してください
+- 情報が見つからない項目はnullにしてください
+- interview_countは文字列で返してください（例："1", "2"）
+- processesは配列で返してください（例：["要件定義", "設計"]、見つからない場合は[]）
+- skillsは配列で返してください（例：["Java", "Spring"]、見つからない場合は[]）
+- foreigner_accepted, freelancer_acceptedはtrue/falseで返してください
+- max_candidatesは数値で返してください
+- JSONのみを返してください
+"""
+
+_PROJECT_SYSTEM_MSG = {
+    "role": "system",
+    "content": "あなたは案件情報抽出の専門家です。必ずJSONのみを返してください。",
+}
+
+_ENGINEER_PROMPT_TMPL = """
+以下のメールから技術者情報を抽出して、必ずJSON形式で返してください。
+
+件名: {subject}
+本文: {body}
+
+以下の形式で抽出してください（データ型と制約に注意）：
+{{
+    "name": "技術者名（文字列、必須）",
+    "email": "メールアドレス（文字列またはnull）",
+    "phone": "電話番号（文字列またはnull）",
+    "gender": "性別（'男性', '女性', '回答しない' のいずれかまたはnull）",
+    "age": "27"（文字列形式で年齢）,
+    "nationality": "国籍（文字列またはnull）",
+    "nearest_station": "最寄り駅（文字列またはnull）",
+    "education": "学歴（文字列またはnull）",
+    "arrival_year_japan": "来日年度（文字列またはnull）",
+    "certifications": ["資格1", "資格2"]（文字列の配列、空の場合は[]）,
+    "skills": ["Java", "Python", "Spring"]（文字列の配列、空の場合は[]）,
+    "technical_keywords": ["Java", "Spring Boot", "MySQL"]（文字列の配列、空の場合は[]）,
+    "experience": "5年"（文字列、必須）,
+    "work_scope": "作業範囲（文字列またはnull）",
+    "work_experience": "職務経歴（文字列またはnull）",
+    "japanese_level": "ビジネスレベル"（必ず以下のいずれか: "不問", "日常会話レベル", "ビジネスレベル", "ネイティブレベル"）,
+    "english_level": "日常会話レベル"（必ず以下のいずれか: "不問", "日常会話レベル", "ビジネスレベル", "ネイティブレベル"）,
+    "availability": "稼働可能時期（文字列またはnull）",
+    "current_status": "提案中"（以下のいずれか: "提案中", "事前面談", "面談", "結果待ち", "契約中", "営業終了", "アーカイブ"）,
+    "preferred_work_style": ["常駐", "リモート"]（文字列の配列、空の場合は[]）,
+    "preferred_locations": ["東京", "大阪"]（文字列の配列、空の場合は[]）,
+    "desired_rate_min": 40（数値のみ、万円単位、不明の場合はnull）,
+    "desired_rate_max": 50（数値のみ、万円単位、不明の場合はnull）,
+    "overtime_available": false（true/false、不明の場合はfalse）,
+    "business_trip_available": false（true/false、不明の場合はfalse）,
+    "self_promotion": "自己PR（文字列またはnull）",
+    "remarks": "備考（文字列またはnull）",
+    "recommendation": "推薦コメント（文字列またはnull）"
+}}
+
+重要な制約事項：
+1. nameとexperienceは必須フィールドです
+2. japanese_levelとenglish_levelは必ず以下の4つの値のみを使用：
+   - "不問" - 要求なし
+   - "日常会話レベル" - N3-N5級、基本会話
+   - "ビジネスレベル" - N2級、ビジネス会話
+   - "ネイティブレベル" - N1級、流暢
+3. genderは "男性", "女性", "回答しない" のいずれかのみ
+4. current_statusは "提案中", "事前面談", "面談", "結果待ち", "契約中", "営業終了", "アーカイブ" のいずれか
+5. 配列フィールドでデータがない場合は[]、nullではありません
+6. 数値フィールドは純粋な数値のみ
+7. 布尔值フィールドはtrue/falseのみ
+8. JSONのみを返してください、他の説明は不要です
+"""
+
+_ENGINEER_SYSTEM_MSG = {
+    "role": "system",
+    "content": "あなたは技術者情報抽出の専門家です。データベース制約を厳密に守り、必ずJSONのみを返してください。",
+}
+
 
 class ExtractionService:
     """数据提取服务"""
 
     def __init__(self):
         self.client_manager = ai_client_manager
+        # 以 (类型, 件名+本文摘要) 为键缓存提取结果，回复/转发的重复邮件无需再次调用AI
+        self._extract_cache = LRUCache(
+            Config.EMAIL_PROCESSING["extraction_cache_size"]
+        )
+        self.max_content_chars = Config.EMAIL_PROCESSING["extraction_max_chars"]
+        self.content_hard_limit = Config.EMAIL_PROCESSING["extraction_hard_limit"]
+
+    def exceeds_hard_limit(self, kind: str, email_data: EmailData) -> bool:
+        """原始正文是否超过硬上限（此时跳过AI提取，调用方也无需再做内容提取）"""
+        body_length = len(email_data.body_text or email_data.body_html or "")
+        if body_length > self.content_hard_limit:
+            logger.warning(
+                f"正文过长 ({body_length} 字符 > {self.content_hard_limit})，"
+                f"跳过{kind}信息的AI提取"
+            )
+            return True
+        return False
+
+    def _bound_content(
+        self, kind: str, email_data: EmailData, extracted_content: str
+    ) -> Optional[str]:
+        """限制发送给AI的正文长度；原始正文超过硬上限时返回 None 表示跳过提取"""
+        if self.exceeds_hard_limit(kind, email_data):
+            return None
+        return extracted_content[: self.max_content_chars]
+
+    def _get_cached_extraction(self, kind: str, subject: str, content: str):
+        """查询提取结果缓存，返回 (缓存键, 缓存结果或None)"""
+        cache_key = (kind, content_digest(subject, content))
+        cached = self._extract_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"命中提取结果缓存，跳过AI调用: {kind}")
+            # 缓存的是已通过验证的字段值，直接 model_construct 跳过重复验证；
+            # 列表字段复制一份，避免调用方修改影响缓存
+            model_cls = _EXTRACTION_MODELS[kind]
+            return cache_key, model_cls.model_construct(
+                **{
+                    key: value.copy() if isinstance(value, list) else value
+                    for key, value in cached.items()
+                }
+            )
+        return cache_key, None
 
     def _extract_json_from_text(self, text: str) -> Optional[Dict]:
         """从文本中提取JSON部分"""
         try:
-            result = json.loads(text.strip())
+            result = fast_json.loads(text.strip())
             return result
-        except json.JSONDecodeError:
-            json_pattern = r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}"
-            matches = re.findall(json_pattern, text, re.DOTALL)
+        except fast_json.JSONDecodeError:
+            matches = _JSON_OBJECT_RE.findall(text)
 
             for match in matches:
                 try:
-                    result = json.loads(match)
+                    result = fast_json.loads(match)
                     return result
-                except json.JSONDecodeError:
+                except fast_json.JSONDecodeError:
                     continue
 
             start_idx = text.find("{")
@@ -49,61 +211,46 @@ class ExtractionService:
                         if brace_count == 0:
                             try:
                                 extracted = text[start_idx : i + 1]
-                                result = json.loads(extracted)
+                                result = fast_json.loads(extracted)
                                 return result
-                            except json.JSONDecodeError:
+                            except fast_json.JSONDecodeError:
                                 break
 
             logger.warning(f"无法从文本中提取JSON: {text[:200]}...")
             return None
 
-    def _parse_date_string(self, date_str: str) -> Optional[str]:
-        """日期字符串解析和标准化"""
+    def _parse_date(self, date_str: str) -> Optional[date]:
+        """日期字符串解析为 date 对象"""
+        if isinstance(date_str, date):
+            return date_str
+
         if not date_str or date_str.strip() == "":
             return None
 
         date_str = date_str.strip()
 
         # 处理"即日"的情况
-        if date_str in ["即日", "即日開始", "すぐ", "今すぐ", "ASAP"]:
-            return datetime.now().strftime("%Y-%m-%d")
+        if date_str in _IMMEDIATE_START_WORDS:
+            return date.today()
 
-        if re.match(r"^\d{4}-\d{2}-\d{2}$", date_str):
+        if _ISO_DATE_RE.match(date_str):
             try:
-                datetime.strptime(date_str, "%Y-%m-%d")
-                return date_str
+                return date.fromisoformat(date_str)
             except ValueError:
                 logger.warning(f"Invalid standard date format: {date_str}")
                 return None
 
         try:
-            match = re.match(r"(\d{4})年(\d{1,2})月?(?:(\d{1,2})日?)?", date_str)
+            match = _JA_DATE_RE.match(date_str) or _NUMERIC_DATE_RE.match(date_str)
             if match:
                 year = int(match.group(1))
                 month = int(match.group(2))
                 day = int(match.group(3)) if match.group(3) else 1
 
-                if 1 <= month <= 12 and 1 <= day <= 31:
-                    formatted_date = f"{year:04d}-{month:02d}-{day:02d}"
-                    try:
-                        datetime.strptime(formatted_date, "%Y-%m-%d")
-                        return formatted_date
-                    except ValueError:
-                        return None
-
-            match = re.match(r"(\d{4})[/-](\d{1,2})(?:[/-](\d{1,2}))?", date_str)
-            if match:
-                year = int(match.group(1))
-                month = int(match.group(2))
-                day = int(match.group(3)) if match.group(3) else 1
-
-                if 1 <= month <= 12 and 1 <= day <= 31:
-                    formatted_date = f"{year:04d}-{month:02d}-{day:02d}"
-                    try:
-                        datetime.strptime(formatted_date, "%Y-%m-%d")
-                        return formatted_date
-                    except ValueError:
-                        return None
+                try:
+                    return date(year, month, day)
+                except ValueError:
+                    return None
 
             return None
 
@@ -115,12 +262,25 @@ class ExtractionService:
         self, email_data: EmailData, extracted_content: str
     ) -> Optional[ProjectStructured]:
         """提取项目信息"""
+        extracted_content = self._bound_content(
+            "project", email_data, extracted_content
+        )
+        if extracted_content is None:
+            return None
+
+        cache_key, cached = self._get_cached_extraction(
+            "project", email_data.subject, extracted_content
+        )
+        if cached is not None:
+            return cached
+
         # 首先尝试主要提取客户端
         try:
             result = await self._extract_project_with_client(
                 email_data, extracted_content, use_fallback=False
             )
             if result:
+                self._extract_cache.set(cache_key, result.model_dump())
                 return result
         except Exception as e:
             logger.warning(f"主要数据提取客户端调用失败: {e}")
@@ -132,6 +292,7 @@ class ExtractionService:
                 email_data, extracted_content, use_fallback=True
             )
             if result:
+                self._extract_cache.set(cache_key, result.model_dump())
                 return result
         except Exception as e:
             logger.warning(f"后备数据提取客户端调用失败: {e}")
@@ -159,58 +320,11 @@ class ExtractionService:
         client_type = "后备" if use_fallback else "主要"
         logger.info(f"使用{client_type}数据提取客户端: {provider_name}")
 
-        prompt = f"""
-以下のメールから案件情報を抽出して、必ずJSON形式で返してください。他の説明は不要です。
+        prompt = _PROJECT_PROMPT_TMPL.format(
+            subject=email_data.subject, body=extracted_content
+        )
 
-件名: {email_data.subject}
-本文: {extracted_content}
-
-以下の形式で抽出してください：
-{{
-    "title": "案件タイトル",
-    "client_company": "クライアント企業名",
-    "partner_company": "パートナー企業名",
-    "description": "案件概要",
-    "detail_description": "詳細説明",
-    "skills": ["必要スキル1", "必要スキル2"],
-    "key_technologies": "主要技術",
-    "location": "勤務地",
-    "work_type": "勤務形態（常駐/リモート/ハイブリッド等）",
-    "start_date": "開始日（YYYY-MM-DD形式、例：2024-06-01）",
-    "duration": "期間",
-    "application_deadline": "応募締切（YYYY-MM-DD形式）",
-    "budget": "予算/単価",
-    "desired_budget": "希望予算",
-    "japanese_level": "日本語レベル",
-    "experience": "必要経験",
-    "foreigner_accepted": true,
-    "freelancer_accepted": true,
-    "interview_count": "1",
-    "processes": ["工程1", "工程2"],
-    "max_candidates": 5,
-    "manager_name": "担当者名",
-    "manager_email": "担当者メール"
-}}
-
-重要：
-- start_dateは必ずYYYY-MM-DD形式で返してください
-- 開始日が即日・すぐ等の場合は現在の日付を使用してください
-- 情報が見つからない項目はnullにしてください
-- interview_countは文字列で返してください（例："1", "2"）
-- processesは配列で返してください（例：["要件定義", "設計"]、見つからない場合は[]）
-- skillsは配列で返してください（例：["Java", "Spring"]、見つからない場合は[]）
-- foreigner_accepted, freelancer_acceptedはtrue/falseで返してください
-- max_candidatesは数値で返してください
-- JSONのみを返してください
-"""
-
-        messages = [
-            {
-                "role": "system",
-                "content": "あなたは案件情報抽出の専門家です。必ずJSONのみを返してください。",
-            },
-            {"role": "user", "content": prompt},
-        ]
+        messages = [_PROJECT_SYSTEM_MSG, {"role": "user", "content": prompt}]
 
         try:
             data = None
@@ -237,7 +351,7 @@ class ExtractionService:
                         },
                     )
                     response.raise_for_status()
-                    response_json = response.json()
+                    response_json = fast_json.loads(response.content)
                     raw_response_content = response_json["choices"][0]["message"][
                         "content"
                     ]
@@ -264,22 +378,20 @@ class ExtractionService:
                 raise ValueError(f"Unsupported extraction provider: {provider_name}")
 
             if data:
-                # 处理日期格式
+                # 处理日期格式（在此一次性解析为 date 对象，保存时直接使用）
                 if not data.get("start_date"):
-                    data["start_date"] = datetime.now().strftime("%Y-%m-%d")
+                    data["start_date"] = date.today()
                     logger.info("项目开始日期未指定，设置为当前日期（即日）")
                 else:
-                    normalized_date = self._parse_date_string(data["start_date"])
-                    data["start_date"] = normalized_date or datetime.now().strftime(
-                        "%Y-%m-%d"
+                    data["start_date"] = (
+                        self._parse_date(data["start_date"]) or date.today()
                     )
 
                 # 处理应募截止日期
                 if data.get("application_deadline"):
-                    normalized_deadline = self._parse_date_string(
+                    data["application_deadline"] = self._parse_date(
                         data["application_deadline"]
                     )
-                    data["application_deadline"] = normalized_deadline
 
                 logger.info(f"{client_type}数据提取客户端成功提取项目信息")
                 return ProjectStructured(**data)
@@ -294,12 +406,25 @@ class ExtractionService:
         self, email_data: EmailData, extracted_content: str
     ) -> Optional[EngineerStructured]:
         """提取工程师信息"""
+        extracted_content = self._bound_content(
+            "engineer", email_data, extracted_content
+        )
+        if extracted_content is None:
+            return None
+
+        cache_key, cached = self._get_cached_extraction(
+            "engineer", email_data.subject, extracted_content
+        )
+        if cached is not None:
+            return cached
+
         # 首先尝试主要提取客户端
         try:
             result = await self._extract_engineer_with_client(
                 email_data, extracted_content, use_fallback=False
             )
             if result:
+                self._extract_cache.set(cache_key, result.model_dump())
                 return result
         except Exception as e:
             logger.warning(f"主要数据提取客户端调用失败: {e}")
@@ -311,6 +436,7 @@ class ExtractionService:
                 email_data, extracted_content, use_fallback=True
             )
             if result:
+                self._extract_cache.set(cache_key, result.model_dump())
                 return result
         except Exception as e:
             logger.warning(f"后备数据提取客户端调用失败: {e}")
@@ -338,66 +464,11 @@ class ExtractionService:
         client_type = "后备" if use_fallback else "主要"
         logger.info(f"使用{client_type}数据提取客户端: {provider_name}")
 
-        prompt = f"""
-以下のメールから技術者情報を抽出して、必ずJSON形式で返してください。
+        prompt = _ENGINEER_PROMPT_TMPL.format(
+            subject=email_data.subject, body=extracted_content[:1500]
+        )
 
-件名: {email_data.subject}
-本文: {extracted_content[:1500]}
-
-以下の形式で抽出してください（データ型と制約に注意）：
-{{
-    "name": "技術者名（文字列、必須）",
-    "email": "メールアドレス（文字列またはnull）",
-    "phone": "電話番号（文字列またはnull）",
-    "gender": "性別（'男性', '女性', '回答しない' のいずれかまたはnull）",
-    "age": "27"（文字列形式で年齢）,
-    "nationality": "国籍（文字列またはnull）",
-    "nearest_station": "最寄り駅（文字列またはnull）",
-    "education": "学歴（文字列またはnull）",
-    "arrival_year_japan": "来日年度（文字列またはnull）",
-    "certifications": ["資格1", "資格2"]（文字列の配列、空の場合は[]）,
-    "skills": ["Java", "Python", "Spring"]（文字列の配列、空の場合は[]）,
-    "technical_keywords": ["Java", "Spring Boot", "MySQL"]（文字列の配列、空の場合は[]）,
-    "experience": "5年"（文字列、必須）,
-    "work_scope": "作業範囲（文字列またはnull）",
-    "work_experience": "職務経歴（文字列またはnull）",
-    "japanese_level": "ビジネスレベル"（必ず以下のいずれか: "不問", "日常会話レベル", "ビジネスレベル", "ネイティブレベル"）,
-    "english_level": "日常会話レベル"（必ず以下のいずれか: "不問", "日常会話レベル", "ビジネスレベル", "ネイティブレベル"）,
-    "availability": "稼働可能時期（文字列またはnull）",
-    "current_status": "提案中"（以下のいずれか: "提案中", "事前面談", "面談", "結果待ち", "契約中", "営業終了", "アーカイブ"）,
-    "preferred_work_style": ["常駐", "リモート"]（文字列の配列、空の場合は[]）,
-    "preferred_locations": ["東京", "大阪"]（文字列の配列、空の場合は[]）,
-    "desired_rate_min": 40（数値のみ、万円単位、不明の場合はnull）,
-    "desired_rate_max": 50（数値のみ、万円単位、不明の場合はnull）,
-    "overtime_available": false（true/false、不明の場合はfalse）,
-    "business_trip_available": false（true/false、不明の場合はfalse）,
-    "self_promotion": "自己PR（文字列またはnull）",
-    "remarks": "備考（文字列またはnull）",
-    "recommendation": "推薦コメント（文字列またはnull）"
-}}
-
-重要な制約事項：
-1. nameとexperienceは必須フィールドです
-2. japanese_levelとenglish_levelは必ず以下の4つの値のみを使用：
-   - "不問" - 要求なし
-   - "日常会話レベル" - N3-N5級、基本会話
-   - "ビジネスレベル" - N2級、ビジネス会話
-   - "ネイティブレベル" - N1級、流暢
-3. genderは "男性", "女性", "回答しない" のいずれかのみ
-4. current_statusは "提案中", "事前面談", "面談", "結果待ち", "契約中", "営業終了", "アーカイブ" のいずれか
-5. 配列フィールドでデータがない場合は[]、nullではありません
-6. 数値フィールドは純粋な数値のみ
-7. 布尔值フィールドはtrue/falseのみ
-8. JSONのみを返してください、他の説明は不要です
-"""
-
-        messages = [
-            {
-                "role": "system",
-                "content": "あなたは技術者情報抽出の専門家です。データベース制約を厳密に守り、必ずJSONのみを返してください。",
-            },
-            {"role": "user", "content": prompt},
-        ]
+        messages = [_ENGINEER_SYSTEM_MSG, {"role": "user", "content": prompt}]
 
         try:
             data = None
@@ -424,7 +495,7 @@ class ExtractionService:
                         },
                     )
                     response.raise_for_status()
-                    response_json = response.json()
+                    response_json = fast_json.loads(response.content)
                     raw_response_content = response_json["choices"][0]["message"][
                         "content"
                     ]
@@ -451,18 +522,15 @@ class ExtractionService:
                 raise ValueError(f"Unsupported extraction provider: {provider_name}")
 
             if data:
-                logger.info(f"{client_type}AI提取的原始数据: {data}")
+                logger.debug("%sAI提取的原始数据: %s", client_type, data)
                 engineer_data = EngineerStructured(**data)
                 logger.info(
                     f"{client_type}数据提取客户端成功提取并验证工程师数据: {engineer_data.name}"
                 )
                 return engineer_data
 
-        except Exception as e:
-            logger.error(f"{client_type}数据提取客户端提取工程师信息失败: {e}")
-            import traceback
-
-            logger.error(f"Full traceback: {traceback.format_exc()}")
+        except Exception:
+            logger.exception(f"{client_type}数据提取客户端提取工程师信息失败")
             raise  # 重新抛出异常以便上层处理fallback
 
         return None
@@ -62,10 +62,18 @@ except ImportError:
 import httpx
 from openai import AsyncOpenAI
 from pydantic import BaseModel, Field, field_validator
+from src.http_client import create_api_client
+from src.models.data_models import TRUTHY_VALUES
+from src.resume_files import (
+    RESUME_EXTENSIONS,
+    RESUME_FILENAME_PATTERNS,
+    has_resume_extension,
+    has_resume_keyword,
+)
+from src import fast_json
 
 logger = logging.getLogger(__name__)
 
-
 class ResumeData(BaseModel):
     """简历数据模型 - 完善的类型转换版本"""
 
@@ -260,6 +268,8 @@ class ResumeData(BaseModel):
         if v is None:
             return []
         if isinstance(v, list):
+            if all(type(item) is str for item in v):
+                return v
             return [str(item) for item in v if item is not None]
         if isinstance(v, str):
             if v.strip() == "":
@@ -290,13 +300,11 @@ class ResumeData(BaseModel):
     @classmethod
     def validate_boolean(cls, v):
         """布尔值验证器"""
-        if v is None:
+        if v is None or v is False:
             return False
-        if isinstance(v, bool):
-            return v
-        if isinstance(v, str):
-            return v.lower() in ("true", "yes", "可能", "可", "ok", "対応可能", "はい")
-        return False
+        if v is True:
+            return True
+        return isinstance(v, str) and v.lower() in TRUTHY_VALUES
 
     @field_validator(
         "nationality",
@@ -353,14 +361,7 @@ class AttachmentProcessor:
             api_base_url = ai_config.get("api_base_url")
             timeout = ai_config.get("timeout", 120.0)
             if api_key and api_base_url:
-                self.ai_client = httpx.AsyncClient(
-                    base_url=api_base_url,
-                    headers={
-                        "Authorization": f"Bearer {api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    timeout=timeout,
-                )
+                self.ai_client = create_api_client(api_base_url, api_key, timeout)
                 logger.info(
                     f"AttachmentProcessor {provider_name.title()} client initialized"
                 )
@@ -739,13 +740,14 @@ class AttachmentProcessor:
                 if text and text.strip():
                     logger.info(f"✅ {method_name} 成功提取了 {len(text)} 字符的文本")
 
-                    # 🔧 确保控制台输出
-                    print(f"\n{'='*60}")
-                    print(f"📊 Excel文件解析结果 (使用 {method_name}):")
-                    print(f"文件名: {filename}")
-                    print(f"{'='*60}")
-                    print(text[:3000] + ("..." if len(text) > 3000 else ""))
-                    print(f"{'='*60}\n")
+                    # 解析结果预览仅在DEBUG级别输出（避免每个文件都格式化大段文本）
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            "📊 Excel文件解析结果 (使用 %s): %s\n%s",
+                            method_name,
+                            filename,
+                            text[:3000] + ("..." if len(text) > 3000 else ""),
+                        )
 
                     return text
                 else:
@@ -968,15 +970,17 @@ class AttachmentProcessor:
                         )
                         response.raise_for_status()
 
-                        response_json = response.json()
+                        response_json = fast_json.loads(response.content)
                         raw_response_content = response_json["choices"][0]["message"][
                             "content"
                         ]
 
-                        logger.info(
-                            f"=== {provider_name.title()} 简历解析响应 ({filename}) ==="
+                        logger.debug(
+                            "=== %s 简历解析响应 (%s) ===\nRaw content:\n%s",
+                            provider_name.title(),
+                            filename,
+                            raw_response_content,
                         )
-                        logger.info(f"Raw content:\n{raw_response_content}")
 
                         data = self._extract_json_from_text(raw_response_content)
                         if data:
@@ -1016,11 +1020,8 @@ class AttachmentProcessor:
                 )
                 return None
 
-        except Exception as e:
-            logger.error(f"Error extracting resume data from {filename}: {e}")
-            import traceback
-
-            logger.error(f"Full traceback: {traceback.format_exc()}")
+        except Exception:
+            logger.exception(f"Error extracting resume data from {filename}")
             return None
 
     async def process_resume_attachments(
@@ -1031,15 +1032,6 @@ class AttachmentProcessor:
 
         # 过滤出可能的简历文件
         resume_files = []
-        resume_extensions = [".docx", ".doc", ".pdf", ".xlsx", ".xls"]
-        engineer_patterns = [
-            r"履歴書",
-            r"職務経歴",
-            r"スキルシート",
-            r"resume",
-            r"cv",
-            r"profile",
-        ]
 
         logger.info(f"🔍 开始分析 {len(attachments)} 个附件")
 
@@ -1049,20 +1041,14 @@ class AttachmentProcessor:
 
             logger.info(f"📄 分析文件: '{filename}' (原始: '{original_filename}')")
 
-            # 检查文件扩展名
-            has_resume_extension = any(
-                filename.endswith(ext) for ext in resume_extensions
-            )
-
-            # 检查文件名关键词
-            has_resume_keyword = any(
-                re.search(pattern, filename) for pattern in engineer_patterns
-            )
+            # 检查文件扩展名和文件名关键词
+            extension_matched = has_resume_extension(filename)
+            keyword_matched = has_resume_keyword(filename)
 
-            logger.info(f"   扩展名匹配: {has_resume_extension}")
-            logger.info(f"   关键词匹配: {has_resume_keyword}")
+            logger.info(f"   扩展名匹配: {extension_matched}")
+            logger.info(f"   关键词匹配: {keyword_matched}")
 
-            if has_resume_extension or has_resume_keyword:
+            if extension_matched or keyword_matched:
                 resume_files.append(attachment)
                 logger.info(f"✅ 确认为简历文件: {filename}")
 
@@ -1097,11 +1083,8 @@ class AttachmentProcessor:
                 else:
                     logger.error(f"❌ 无法从 {filename} 提取简历数据")
 
-            except Exception as e:
-                logger.error(f"💥 处理简历文件 {filename} 时出错: {e}")
-                import traceback
-
-                logger.error(f"详细错误: {traceback.format_exc()}")
+            except Exception:
+                logger.exception(f"💥 处理简历文件 {filename} 时出错")
                 continue
 
         logger.info(f"🎯 简历处理完成，成功提取 {len(resume_data_list)} 份简历数据")
@@ -1113,16 +1096,6 @@ class AttachmentProcessor:
             logger.info("📎 没有附件")
             return False
 
-        resume_extensions = [".docx", ".doc", ".pdf", ".xlsx", ".xls"]
-        engineer_patterns = [
-            r"履歴書",
-            r"職務経歴",
-            r"スキルシート",
-            r"resume",
-            r"cv",
-            r"profile",
-        ]
-
         logger.info(f"📎 检查 {len(attachments)} 个附件是否为简历文件")
 
         for i, attachment in enumerate(attachments, 1):
@@ -1132,26 +1105,22 @@ class AttachmentProcessor:
             logger.info(f"📄 附件 {i}: '{filename}' (原始: '{original_filename}')")
 
             # 检查文件扩展名
-            has_resume_extension = any(
-                filename.endswith(ext) for ext in resume_extensions
-            )
+            extension_matched = has_resume_extension(filename)
 
-            if has_resume_extension:
+            if extension_matched:
                 logger.info(f"✅ 附件 {i} 匹配简历扩展名")
             else:
-                logger.info(f"❌ 附件 {i} 不匹配简历扩展名 {resume_extensions}")
+                logger.info(f"❌ 附件 {i} 不匹配简历扩展名 {list(RESUME_EXTENSIONS)}")
 
             # 检查文件名关键词
-            has_resume_keyword = any(
-                re.search(pattern, filename) for pattern in engineer_patterns
-            )
+            keyword_matched = has_resume_keyword(filename)
 
-            if has_resume_keyword:
+            if keyword_matched:
                 logger.info(f"✅ 附件 {i} 匹配简历关键词")
             else:
-                logger.info(f"❌ 附件 {i} 不匹配简历关键词 {engineer_patterns}")
+                logger.info(f"❌ 附件 {i} 不匹配简历关键词 {RESUME_FILENAME_PATTERNS}")
 
-            if has_resume_extension or has_resume_keyword:
+            if extension_matched or keyword_matched:
                 logger.info(f"🎯 确认附件 {i} 为简历文件")
                 return True
 
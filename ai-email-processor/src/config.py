@@ -22,7 +22,11 @@ class Config:
         "user": os.getenv("DB_USER", "postgres"),
         "password": os.getenv("DB_PASSWORD", ""),
         "min_size": int(os.getenv("DB_POOL_MIN", 10)),
-        "max_size": int(os.getenv("DB_POOL_MAX", 20)),
+        "max_size": int(os.getenv("DB_POOL_MAX", 50)),
+        "max_inactive_connection_lifetime": float(
+            os.getenv("DB_POOL_MAX_INACTIVE_LIFETIME", 300)
+        ),
+        "statement_cache_size": int(os.getenv("DB_STATEMENT_CACHE_SIZE", 1024)),
     }
 
     # AI服务配置 - 支持分离式配置
@@ -98,6 +102,26 @@ class Config:
         "interval_minutes": int(os.getenv("EMAIL_CHECK_INTERVAL", 10)),
         "retry_attempts": int(os.getenv("EMAIL_RETRY_ATTEMPTS", 3)),
         "retry_delay": int(os.getenv("EMAIL_RETRY_DELAY", 60)),
+        # 单个租户内并发处理的邮件数（需不超过数据库连接池 min_size）
+        "max_concurrency": int(os.getenv("EMAIL_MAX_CONCURRENCY", 8)),
+        # 同时处理的租户数（与 max_concurrency 相乘即最大并发数据库连接数）
+        "tenant_concurrency": int(os.getenv("TENANT_MAX_CONCURRENCY", 4)),
+        # 发送给AI提取的正文最大字符数（超出部分截断）
+        "extraction_max_chars": int(os.getenv("EXTRACTION_MAX_CHARS", 6000)),
+        # 正文超过此字符数时不调用AI提取（多为引用/签名堆积的异常邮件）
+        "extraction_hard_limit": int(os.getenv("EXTRACTION_HARD_LIMIT", 40000)),
+        # AI提取结果的进程内LRU缓存条目数（0 表示禁用）
+        "extraction_cache_size": int(os.getenv("EXTRACTION_CACHE_SIZE", 1024)),
+        # 有简历附件时同时启动正文提取（简历保存成功则取消，失败时省去串行等待）
+        "speculative_body_extraction": os.getenv(
+            "SPECULATIVE_BODY_EXTRACTION", "true"
+        ).lower()
+        == "true",
+        # 对邮件获取器产出的邮件字典重新做完整校验（默认信任解析器已校验过的数据）
+        "strict_email_validation": os.getenv(
+            "STRICT_EMAIL_VALIDATION", "false"
+        ).lower()
+        == "true",
     }
 
     # 改进邮件分类器配置
@@ -115,6 +139,20 @@ class Config:
         == "true",
         "classification_timeout": int(os.getenv("CLASSIFICATION_TIMEOUT", 30)),
         "spam_keywords_threshold": int(os.getenv("SPAM_KEYWORDS_THRESHOLD", 2)),
+        # 综合评分超过此值时规则判断已足够明确，跳过AI分类调用
+        "ai_skip_score_threshold": float(os.getenv("AI_SKIP_SCORE_THRESHOLD", 8.0)),
+        # 分类结果的进程内LRU缓存条目数（按邮件内容摘要，0 表示禁用）
+        "cache_size": int(os.getenv("CLASSIFICATION_CACHE_SIZE", 4096)),
+        # 按发件人历史分类直接确定类型（跳过规则分析和AI调用）
+        "sender_shortcut": {
+            "enabled": os.getenv("SENDER_SHORTCUT_ENABLED", "false").lower() == "true",
+            # 发件人至少有这么多封同类型邮件才使用快捷映射
+            "min_emails": int(os.getenv("SENDER_SHORTCUT_MIN_EMAILS", 5)),
+            # 同类型邮件占该发件人全部邮件的最低比例
+            "min_ratio": float(os.getenv("SENDER_SHORTCUT_MIN_RATIO", 0.95)),
+            # 映射按租户缓存的秒数，过期后从数据库重建
+            "ttl": float(os.getenv("SENDER_SHORTCUT_TTL", 3600)),
+        },
         "keyword_weights": {
             "high": float(os.getenv("KEYWORD_WEIGHT_HIGH", 3.0)),
             "medium": float(os.getenv("KEYWORD_WEIGHT_MEDIUM", 1.5)),
@@ -1,7 +1,7 @@
 # src/database/__init__.py
 """数据库包"""
 
-from .database_manager import DatabaseManager, db_manager
+from .database_manager import DatabaseManager, db_manager, get_pool, close_pool
 from .email_repository import EmailRepository, email_repository
 from .project_repository import ProjectRepository, project_repository
 from .engineer_repository import EngineerRepository, engineer_repository
@@ -9,6 +9,8 @@ from .engineer_repository import EngineerRepository, engineer_repository
 __all__ = [
     "DatabaseManager",
     "db_manager",
+    "get_pool",
+    "close_pool",
     "EmailRepository",
     "email_repository",
     "ProjectRepository",
@@ -1,6 +1,7 @@
 # src/database/database_manager.py
 """数据库连接管理器"""
 
+import asyncio
 import logging
 from typing import Dict, Optional
 import asyncpg
@@ -8,6 +9,49 @@ from contextlib import asynccontextmanager
 
 logger = logging.getLogger(__name__)
 
+# 进程级共享连接池（所有 DatabaseManager / EmailProcessor 实例复用）
+# 连接池和锁都绑定创建时的事件循环，事件循环变化时重新创建
+_POOL: Optional[asyncpg.Pool] = None
+_POOL_LOCK: Optional[asyncio.Lock] = None
+_POOL_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+async def get_pool(db_config: Dict) -> asyncpg.Pool:
+    """获取进程级共享连接池，首次调用时创建（双重检查加锁）"""
+    global _POOL, _POOL_LOCK, _POOL_LOOP
+
+    loop = asyncio.get_running_loop()
+    if _POOL_LOOP is not loop:
+        if _POOL is not None:
+            # 连接池属于之前的事件循环（如再次调用 asyncio.run），无法在此关闭
+            logger.warning(
+                "Database pool belongs to a previous event loop, creating a new one"
+            )
+        _POOL, _POOL_LOCK, _POOL_LOOP = None, asyncio.Lock(), loop
+
+    if _POOL is None:
+        async with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = await asyncpg.create_pool(**db_config)
+                logger.info("Database pool created successfully")
+
+    return _POOL
+
+
+async def close_pool():
+    """关闭进程级共享连接池（再次调用 get_pool 时重新创建）"""
+    global _POOL
+
+    if _POOL is None:
+        return
+
+    pool, _POOL = _POOL, None
+    if _POOL_LOOP is asyncio.get_running_loop():
+        await pool.close()
+        logger.info("Database pool closed")
+    else:
+        logger.warning("Dropped a database pool created in a previous event loop")
+
 
 class DatabaseManager:
     """数据库连接管理器"""
@@ -17,15 +61,13 @@ class DatabaseManager:
         self.db_pool: Optional[asyncpg.Pool] = None
 
     async def initialize(self):
-        """初始化数据库连接池"""
-        self.db_pool = await asyncpg.create_pool(**self.db_config)
-        logger.info("Database pool created successfully")
+        """初始化数据库连接池（复用进程级共享连接池）"""
+        self.db_pool = await get_pool(self.db_config)
 
     async def close(self):
-        """关闭数据库连接池"""
-        if self.db_pool:
-            await self.db_pool.close()
-            logger.info("Database pool closed")
+        """关闭数据库连接池（共享连接池，下次 initialize 时重新创建）"""
+        self.db_pool = None
+        await close_pool()
 
     @asynccontextmanager
     async def get_connection(self):
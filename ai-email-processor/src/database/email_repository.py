@@ -1,77 +1,134 @@
 # src/database/email_repository.py
 """邮件相关数据库操作"""
 
-import json
 import logging
-from typing import List, Dict, Optional
+import uuid
+from typing import List, Dict, Optional, Sequence, Tuple
 from datetime import datetime
 
 from src.models.data_models import EmailData, EmailType, ProcessingStatus, SMTPSettings
 from src.database.database_manager import db_manager
-from src.encryption_utils import decrypt, DecryptionError
-from src.config import Config
+from src.encryption_utils import decrypt_batch_default
+from src import fast_json
 
 logger = logging.getLogger(__name__)
 
+# 固定的查询文本：连接池的 statement_cache_size 以 SQL 文本为键缓存服务端预处理语句，
+# 每个池连接只需 parse/plan 一次。
+# smtp_password_encrypted 按原始列值读取（bytea 或 '\x...'/裸十六进制 text），
+# 在 Python 中逐行转换，个别格式错误的值只跳过该行
+SMTP_SETTINGS_SQL = """
+    SELECT id, smtp_host, smtp_port, smtp_username,
+           smtp_password_encrypted, security_protocol,
+           from_email, from_name
+    FROM email_smtp_settings
+    WHERE tenant_id = $1 AND is_active = true
+    ORDER BY is_default DESC
+"""
+
+INSERT_EMAIL_SQL = """
+    INSERT INTO receive_emails (
+        tenant_id, subject, body_text, body_html,
+        sender_name, sender_email, email_type,
+        processing_status, ai_extracted_data,
+        received_at, attachments, recipient_to,
+        recipient_cc, recipient_bcc
+    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
+    RETURNING id
+"""
+
+
+# 批量保存用：邮件ID由客户端生成，无需 RETURNING，可由 executemany 一次往返写入全部行
+INSERT_EMAIL_WITH_ID_SQL = """
+    INSERT INTO receive_emails (
+        tenant_id, subject, body_text, body_html,
+        sender_name, sender_email, email_type,
+        processing_status, ai_extracted_data,
+        received_at, attachments, recipient_to,
+        recipient_cc, recipient_bcc, id
+    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15)
+"""
+
+# 批量状态更新：每行一组参数，由 executemany 在一次往返中流水线执行
+UPDATE_EMAIL_STATUS_SQL = """
+    UPDATE receive_emails
+    SET processing_status = $2,
+        ai_extraction_status = $3,
+        processing_error = COALESCE($4, processing_error)
+    WHERE id = $1
+"""
+
+
+# 近90天内几乎只发送同一类（项目/工程师）邮件的发件人；比例按该发件人全部邮件计算
+SENDER_EMAIL_TYPES_SQL = """
+    SELECT sender_email, email_type
+    FROM (
+        SELECT lower(sender_email) AS sender_email, email_type,
+               count(*) AS type_count,
+               sum(count(*)) OVER (PARTITION BY lower(sender_email)) AS total_count
+        FROM receive_emails
+        WHERE tenant_id = $1 AND received_at >= now() - interval '90 days'
+        GROUP BY lower(sender_email), email_type
+    ) s
+    WHERE email_type IN ('project_related', 'engineer_related')
+      AND type_count >= $2
+      AND type_count >= total_count * $3::float8
+"""
+
+
+# 单封邮件状态更新：未传入的关联ID/错误信息保持原值，SQL 文本固定以命中语句缓存
+UPDATE_EMAIL_STATUS_FULL_SQL = """
+    UPDATE receive_emails
+    SET processing_status = $2,
+        ai_extraction_status = $3,
+        project_id = COALESCE($4, project_id),
+        engineer_id = COALESCE($5, engineer_id),
+        processing_error = COALESCE($6, processing_error)
+    WHERE id = $1
+"""
+
 
 class EmailRepository:
     """邮件数据库操作类"""
 
+    @staticmethod
+    def _password_token(row) -> Optional[bytes]:
+        """将密码列值转换为密文 bytes（text 列为十六进制文本，可带 \\x 前缀）"""
+        password_data = row["smtp_password_encrypted"]
+        if not password_data or isinstance(password_data, bytes):
+            return password_data or None
+
+        if isinstance(password_data, str):
+            hex_str = password_data
+            if hex_str.startswith("\\x"):
+                hex_str = hex_str[2:]
+            try:
+                return bytes.fromhex(hex_str)
+            except ValueError as e:
+                logger.error(
+                    f"Failed to convert hex string to bytes for SMTP setting "
+                    f"{row['id']}: {e}"
+                )
+                return None
+
+        logger.error(f"Unexpected password data type {type(password_data)}")
+        return None
+
     async def get_smtp_settings(self, tenant_id: str) -> List[SMTPSettings]:
         """获取租户的SMTP设置"""
         async with db_manager.get_connection() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT id, smtp_host, smtp_port, smtp_username, 
-                       smtp_password_encrypted, security_protocol,
-                       from_email, from_name
-                FROM email_smtp_settings
-                WHERE tenant_id = $1 AND is_active = true
-                ORDER BY is_default DESC
-                """,
-                tenant_id,
+            rows = await conn.fetch(SMTP_SETTINGS_SQL, tenant_id)
+
+            # 一次性解密全部密码（按密钥缓存的解密实例只创建一次）
+            passwords = decrypt_batch_default(
+                [self._password_token(row) for row in rows]
             )
 
             settings = []
-            for row in rows:
-                decrypted_password = None
-                try:
-                    if row["smtp_password_encrypted"]:
-                        password_data = row["smtp_password_encrypted"]
-
-                        # 处理text类型字段
-                        if isinstance(password_data, str):
-                            hex_str = password_data
-                            if hex_str.startswith("\\x"):
-                                hex_str = hex_str[2:]
-                            try:
-                                password_bytes = bytes.fromhex(hex_str)
-                                decrypted_password = decrypt(
-                                    password_bytes, Config.ENCRYPTION_KEY
-                                )
-                            except ValueError as ve:
-                                logger.error(
-                                    f"Failed to convert hex string to bytes for SMTP setting {row['id']}: {ve}"
-                                )
-                                continue
-                        elif isinstance(password_data, bytes):
-                            decrypted_password = decrypt(
-                                password_data, Config.ENCRYPTION_KEY
-                            )
-                        else:
-                            logger.error(
-                                f"Unexpected password data type {type(password_data)}"
-                            )
-                            continue
-
-                except DecryptionError as e:
+            for row, decrypted_password in zip(rows, passwords):
+                if row["smtp_password_encrypted"] and decrypted_password is None:
                     logger.error(
-                        f"Failed to decrypt password for SMTP setting {row['id']}: {e}"
-                    )
-                    continue
-                except Exception as e:
-                    logger.error(
-                        f"Unexpected error decrypting password for SMTP setting {row['id']}: {e}"
+                        f"Failed to decrypt password for SMTP setting {row['id']}"
                     )
                     continue
 
@@ -100,45 +157,74 @@ class EmailRepository:
     ) -> str:
         """保存邮件到数据库"""
         async with db_manager.get_connection() as conn:
-            # 附件信息转换为JSON（不包含二进制内容）
-            attachments_json = []
-            for attachment in email_data.attachments:
-                attachment_info = {
-                    "filename": attachment.get("filename"),
-                    "content_type": attachment.get("content_type"),
-                    "size": attachment.get("size"),
-                }
-                attachments_json.append(attachment_info)
-
             email_id = await conn.fetchval(
-                """
-                INSERT INTO receive_emails (
-                    tenant_id, subject, body_text, body_html,
-                    sender_name, sender_email, email_type,
-                    processing_status, ai_extracted_data,
-                    received_at, attachments, recipient_to,
-                    recipient_cc, recipient_bcc
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
-                RETURNING id
-                """,
-                tenant_id,
-                email_data.subject,
-                email_data.body_text,
-                email_data.body_html,
-                email_data.sender_name,
-                email_data.sender_email,
-                email_type.value,
-                ProcessingStatus.PROCESSING.value,
-                json.dumps(extracted_data) if extracted_data else "{}",
-                email_data.received_at,
-                json.dumps(attachments_json),
-                email_data.recipient_to,
-                email_data.recipient_cc,
-                email_data.recipient_bcc,
+                INSERT_EMAIL_SQL,
+                *self._email_insert_args(
+                    tenant_id, email_data, email_type, extracted_data
+                ),
             )
 
             return str(email_id)
 
+    async def save_emails(
+        self,
+        tenant_id: str,
+        emails: Sequence[Tuple[EmailData, EmailType]],
+    ) -> List[str]:
+        """批量保存邮件到数据库（executemany 单次往返、单事务），按输入顺序返回邮件ID
+
+        邮件ID在客户端预先生成，省去逐行 RETURNING 的往返
+        """
+        if not emails:
+            return []
+
+        email_ids = [uuid.uuid4() for _ in emails]
+        async with db_manager.get_transaction() as conn:
+            await conn.executemany(
+                INSERT_EMAIL_WITH_ID_SQL,
+                [
+                    (*self._email_insert_args(tenant_id, email_data, email_type), eid)
+                    for (email_data, email_type), eid in zip(emails, email_ids)
+                ],
+            )
+
+        return [str(email_id) for email_id in email_ids]
+
+    @staticmethod
+    def _email_insert_args(
+        tenant_id: str,
+        email_data: EmailData,
+        email_type: EmailType,
+        extracted_data: Optional[Dict] = None,
+    ) -> tuple:
+        """构建 INSERT_EMAIL_SQL 的参数"""
+        # 附件信息转换为JSON（不包含二进制内容）
+        attachments_json = [
+            {
+                "filename": attachment.get("filename"),
+                "content_type": attachment.get("content_type"),
+                "size": attachment.get("size"),
+            }
+            for attachment in email_data.attachments
+        ]
+
+        return (
+            tenant_id,
+            email_data.subject,
+            email_data.body_text,
+            email_data.body_html,
+            email_data.sender_name,
+            email_data.sender_email,
+            email_type.value,
+            ProcessingStatus.PROCESSING.value,
+            fast_json.dumps(extracted_data) if extracted_data else "{}",
+            email_data.received_at,
+            fast_json.dumps(attachments_json),
+            email_data.recipient_to,
+            email_data.recipient_cc,
+            email_data.recipient_bcc,
+        )
+
     async def update_email_status(
         self,
         email_id: str,
@@ -150,32 +236,65 @@ class EmailRepository:
     ):
         """更新邮件处理状态"""
         async with db_manager.get_connection() as conn:
-            update_fields = ["processing_status = $2", "ai_extraction_status = $3"]
-            params = [email_id, processing_status.value, ai_extraction_status]
-            param_index = 4
-
-            if project_id:
-                update_fields.append(f"project_id = ${param_index}")
-                params.append(project_id)
-                param_index += 1
-
-            if engineer_id:
-                update_fields.append(f"engineer_id = ${param_index}")
-                params.append(engineer_id)
-                param_index += 1
-
-            if error_message:
-                update_fields.append(f"processing_error = ${param_index}")
-                params.append(error_message)
-                param_index += 1
-
-            query = f"""
-                UPDATE receive_emails 
-                SET {', '.join(update_fields)}
-                WHERE id = $1
-            """
-
-            await conn.execute(query, *params)
+            await conn.execute(
+                UPDATE_EMAIL_STATUS_FULL_SQL,
+                email_id,
+                processing_status.value,
+                ai_extraction_status,
+                project_id or None,
+                engineer_id or None,
+                error_message or None,
+            )
+
+    async def update_email_statuses(
+        self,
+        updates: Sequence[Tuple[str, ProcessingStatus, str, Optional[str]]],
+    ):
+        """批量更新邮件处理状态
+
+        updates 每项为 (email_id, processing_status, ai_extraction_status, error_message)
+        """
+        if not updates:
+            return
+
+        async with db_manager.get_connection() as conn:
+            await conn.executemany(
+                UPDATE_EMAIL_STATUS_SQL,
+                [
+                    (email_id, status.value, ai_extraction_status, error_message)
+                    for email_id, status, ai_extraction_status, error_message in updates
+                ],
+            )
+
+    async def mark_emails_processed(
+        self, email_ids: List[str], ai_extraction_status: str = "completed"
+    ):
+        """批量将无需数据提取的邮件标记为已处理（单条 UPDATE）"""
+        if not email_ids:
+            return
+
+        async with db_manager.get_connection() as conn:
+            await conn.execute(
+                """
+                UPDATE receive_emails
+                SET processing_status = $1, ai_extraction_status = $2
+                WHERE id = ANY($3::uuid[])
+                """,
+                ProcessingStatus.PROCESSED.value,
+                ai_extraction_status,
+                email_ids,
+            )
+
+    async def get_sender_email_types(
+        self, tenant_id: str, min_emails: int, min_ratio: float
+    ) -> Dict[str, EmailType]:
+        """按历史分类获取类型稳定的发件人（小写邮箱 → 邮件类型）"""
+        async with db_manager.get_connection() as conn:
+            rows = await conn.fetch(
+                SENDER_EMAIL_TYPES_SQL, tenant_id, min_emails, min_ratio
+            )
+
+        return {row["sender_email"]: EmailType(row["email_type"]) for row in rows}
 
     async def get_active_tenant_ids(self) -> List[str]:
         """获取所有活跃租户ID"""
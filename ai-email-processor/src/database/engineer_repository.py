@@ -3,14 +3,78 @@
 
 import logging
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Sequence
 
-from src.models.data_models import EngineerStructured
+from src.models.data_models import EngineerStructured, ProcessingStatus
 from src.attachment_processor import ResumeData
 from src.database.database_manager import db_manager
 
 logger = logging.getLogger(__name__)
 
+# 固定的 INSERT 文本：连接池的语句缓存按 SQL 文本复用服务端预处理语句
+INSERT_ENGINEER_SQL = """
+    INSERT INTO engineers (
+        tenant_id, name, email, phone, gender, age,
+        nationality, nearest_station, education,
+        arrival_year_japan, certifications, skills,
+        technical_keywords, experience, work_scope,
+        work_experience, japanese_level, english_level,
+        availability, preferred_work_style, preferred_locations,
+        desired_rate_min, desired_rate_max, overtime_available,
+        business_trip_available, self_promotion, remarks,
+        recommendation, company_type, source, current_status,
+        created_at
+    ) VALUES (
+        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12,
+        $13, $14, $15, $16, $17, $18, $19, $20, $21, $22,
+        $23, $24, $25, $26, $27, $28, '他社', 'mail', $29,
+        $30
+    )
+    RETURNING id
+"""
+
+INSERT_ENGINEER_FROM_RESUME_SQL = """
+    INSERT INTO engineers (
+        tenant_id, name, email, phone, gender, age,
+        nationality, nearest_station, education,
+        arrival_year_japan, certifications, skills,
+        technical_keywords, experience, work_scope,
+        work_experience, japanese_level, english_level,
+        availability, preferred_work_style, preferred_locations,
+        desired_rate_min, desired_rate_max, overtime_available,
+        business_trip_available, self_promotion, remarks,
+        recommendation, company_type, source, current_status,
+        resume_text, created_at
+    ) VALUES (
+        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12,
+        $13, $14, $15, $16, $17, $18, $19, $20, $21, $22,
+        $23, $24, $25, $26, $27, $28, '他社', 'mail', '提案中',
+        $29, $30
+    )
+    RETURNING id
+"""
+
+# 插入工程师并在同一语句中回写来源邮件的 engineer_id 与处理状态（省去一次往返）
+_LINK_EMAIL_SQL_TMPL = """
+    WITH ins AS ({insert_sql}),
+    upd AS (
+        UPDATE receive_emails
+        SET engineer_id = (SELECT id FROM ins),
+            processing_status = ${status_param},
+            ai_extraction_status = 'completed'
+        WHERE id = ${email_param}
+    )
+    SELECT id FROM ins
+"""
+
+INSERT_ENGINEER_AND_LINK_EMAIL_SQL = _LINK_EMAIL_SQL_TMPL.format(
+    insert_sql=INSERT_ENGINEER_SQL, status_param=31, email_param=32
+)
+
+INSERT_ENGINEER_FROM_RESUME_AND_LINK_EMAIL_SQL = _LINK_EMAIL_SQL_TMPL.format(
+    insert_sql=INSERT_ENGINEER_FROM_RESUME_SQL, status_param=31, email_param=32
+)
+
 
 class EngineerRepository:
     """工程师数据库操作类"""
@@ -20,31 +84,23 @@ class EngineerRepository:
         tenant_id: str,
         engineer_data: EngineerStructured,
         sender_email: str,
+        created_at: Optional[datetime] = None,
+        email_id: Optional[str] = None,
     ) -> Optional[str]:
-        """保存工程师信息到数据库（从邮件正文提取）"""
+        """保存工程师信息到数据库（从邮件正文提取）
+
+        指定 email_id 时，在同一条语句中将邮件标记为已处理并关联工程师
+        """
+        if email_id:
+            sql = INSERT_ENGINEER_AND_LINK_EMAIL_SQL
+            link_args = (ProcessingStatus.PROCESSED.value, email_id)
+        else:
+            sql, link_args = INSERT_ENGINEER_SQL, ()
+
         async with db_manager.get_transaction() as conn:
             try:
                 engineer_id = await conn.fetchval(
-                    """
-                    INSERT INTO engineers (
-                        tenant_id, name, email, phone, gender, age,
-                        nationality, nearest_station, education,
-                        arrival_year_japan, certifications, skills,
-                        technical_keywords, experience, work_scope,
-                        work_experience, japanese_level, english_level,
-                        availability, preferred_work_style, preferred_locations,
-                        desired_rate_min, desired_rate_max, overtime_available,
-                        business_trip_available, self_promotion, remarks,
-                        recommendation, company_type, source, current_status,
-                        created_at
-                    ) VALUES (
-                        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12,
-                        $13, $14, $15, $16, $17, $18, $19, $20, $21, $22,
-                        $23, $24, $25, $26, $27, $28, '他社', 'mail', $29,
-                        $30
-                    )
-                    RETURNING id
-                    """,
+                    sql,
                     tenant_id,
                     engineer_data.name,
                     engineer_data.email or sender_email,
@@ -74,7 +130,8 @@ class EngineerRepository:
                     engineer_data.remarks,
                     engineer_data.recommendation,
                     engineer_data.current_status or "提案中",
-                    datetime.now(),
+                    created_at or datetime.now(),
+                    *link_args,
                 )
 
                 logger.info(
@@ -91,61 +148,27 @@ class EngineerRepository:
         tenant_id: str,
         resume_data: ResumeData,
         sender_email: str,
+        created_at: Optional[datetime] = None,
+        email_id: Optional[str] = None,
     ) -> Optional[str]:
-        """保存工程师信息到数据库（从简历附件提取）"""
+        """保存工程师信息到数据库（从简历附件提取）
+
+        指定 email_id 时，在同一条语句中将邮件标记为已处理并关联工程师
+        """
+        if email_id:
+            sql = INSERT_ENGINEER_FROM_RESUME_AND_LINK_EMAIL_SQL
+            link_args = (ProcessingStatus.PROCESSED.value, email_id)
+        else:
+            sql, link_args = INSERT_ENGINEER_FROM_RESUME_SQL, ()
+
         async with db_manager.get_transaction() as conn:
             try:
                 engineer_id = await conn.fetchval(
-                    """
-                    INSERT INTO engineers (
-                        tenant_id, name, email, phone, gender, age,
-                        nationality, nearest_station, education,
-                        arrival_year_japan, certifications, skills,
-                        technical_keywords, experience, work_scope,
-                        work_experience, japanese_level, english_level,
-                        availability, preferred_work_style, preferred_locations,
-                        desired_rate_min, desired_rate_max, overtime_available,
-                        business_trip_available, self_promotion, remarks,
-                        recommendation, company_type, source, current_status,
-                        resume_text, created_at
-                    ) VALUES (
-                        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12,
-                        $13, $14, $15, $16, $17, $18, $19, $20, $21, $22,
-                        $23, $24, $25, $26, $27, $28, '他社', 'mail', '提案中',
-                        $29, $30
-                    )
-                    RETURNING id
-                    """,
-                    tenant_id,
-                    resume_data.name,
-                    resume_data.email or sender_email,
-                    resume_data.phone,
-                    resume_data.gender,
-                    resume_data.age,
-                    resume_data.nationality,
-                    resume_data.nearest_station,
-                    resume_data.education,
-                    resume_data.arrival_year_japan,
-                    resume_data.certifications or [],
-                    resume_data.skills or [],
-                    resume_data.technical_keywords or [],
-                    resume_data.experience,
-                    resume_data.work_scope,
-                    resume_data.work_experience,
-                    resume_data.japanese_level,
-                    resume_data.english_level,
-                    resume_data.availability,
-                    resume_data.preferred_work_style or [],
-                    resume_data.preferred_locations or [],
-                    resume_data.desired_rate_min,
-                    resume_data.desired_rate_max,
-                    resume_data.overtime_available or False,
-                    resume_data.business_trip_available or False,
-                    resume_data.self_promotion,
-                    resume_data.remarks,
-                    resume_data.recommendation,
-                    f"从简历文件提取: {resume_data.source_filename}",
-                    datetime.now(),
+                    sql,
+                    *self._resume_insert_args(
+                        tenant_id, resume_data, sender_email, created_at
+                    ),
+                    *link_args,
                 )
 
                 logger.info(
@@ -159,6 +182,99 @@ class EngineerRepository:
                 )
                 raise
 
+    async def save_engineers_from_resumes(
+        self,
+        tenant_id: str,
+        resume_data_list: Sequence[ResumeData],
+        sender_email: str,
+        created_at: Optional[datetime] = None,
+        email_id: Optional[str] = None,
+    ) -> List[str]:
+        """批量保存简历提取的工程师（单连接、单事务、同一预处理语句），按输入顺序返回ID
+
+        指定 email_id 时，第一份简历的插入语句同时将邮件标记为已处理并关联该工程师
+        """
+        if not resume_data_list:
+            return []
+
+        created_at = created_at or datetime.now()
+        engineer_ids = []
+
+        async with db_manager.get_transaction() as conn:
+            try:
+                remaining = resume_data_list
+                if email_id:
+                    first, remaining = resume_data_list[0], resume_data_list[1:]
+                    engineer_id = await conn.fetchval(
+                        INSERT_ENGINEER_FROM_RESUME_AND_LINK_EMAIL_SQL,
+                        *self._resume_insert_args(
+                            tenant_id, first, sender_email, created_at
+                        ),
+                        ProcessingStatus.PROCESSED.value,
+                        email_id,
+                    )
+                    engineer_ids.append(str(engineer_id))
+
+                if remaining:
+                    stmt = await conn.prepare(INSERT_ENGINEER_FROM_RESUME_SQL)
+                    for resume_data in remaining:
+                        engineer_id = await stmt.fetchval(
+                            *self._resume_insert_args(
+                                tenant_id, resume_data, sender_email, created_at
+                            )
+                        )
+                        engineer_ids.append(str(engineer_id))
+
+            except Exception as e:
+                logger.error(f"Error saving engineers from resumes: {e}")
+                raise
+
+        logger.info(
+            f"Engineers from resumes saved successfully: {', '.join(engineer_ids)}"
+        )
+        return engineer_ids
+
+    @staticmethod
+    def _resume_insert_args(
+        tenant_id: str,
+        resume_data: ResumeData,
+        sender_email: str,
+        created_at: Optional[datetime] = None,
+    ) -> tuple:
+        """构建 INSERT_ENGINEER_FROM_RESUME_SQL 的参数"""
+        return (
+            tenant_id,
+            resume_data.name,
+            resume_data.email or sender_email,
+            resume_data.phone,
+            resume_data.gender,
+            resume_data.age,
+            resume_data.nationality,
+            resume_data.nearest_station,
+            resume_data.education,
+            resume_data.arrival_year_japan,
+            resume_data.certifications or [],
+            resume_data.skills or [],
+            resume_data.technical_keywords or [],
+            resume_data.experience,
+            resume_data.work_scope,
+            resume_data.work_experience,
+            resume_data.japanese_level,
+            resume_data.english_level,
+            resume_data.availability,
+            resume_data.preferred_work_style or [],
+            resume_data.preferred_locations or [],
+            resume_data.desired_rate_min,
+            resume_data.desired_rate_max,
+            resume_data.overtime_available or False,
+            resume_data.business_trip_available or False,
+            resume_data.self_promotion,
+            resume_data.remarks,
+            resume_data.recommendation,
+            f"从简历文件提取: {resume_data.source_filename}",
+            created_at or datetime.now(),
+        )
+
     async def get_engineer_by_id(self, engineer_id: str) -> Optional[dict]:
         """根据ID获取工程师信息"""
         async with db_manager.get_connection() as conn:
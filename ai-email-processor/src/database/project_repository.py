@@ -5,11 +5,45 @@ import logging
 from datetime import datetime, date
 from typing import Optional
 
-from src.models.data_models import ProjectStructured
+from src.models.data_models import ProjectStructured, ProcessingStatus
 from src.database.database_manager import db_manager
 
 logger = logging.getLogger(__name__)
 
+# 固定的 INSERT 文本：连接池的语句缓存按 SQL 文本复用服务端预处理语句
+INSERT_PROJECT_SQL = """
+    INSERT INTO projects (
+        tenant_id, title, client_company, partner_company,
+        description, detail_description, skills, key_technologies,
+        location, work_type, start_date, duration,
+        application_deadline, budget, desired_budget,
+        japanese_level, experience, foreigner_accepted,
+        freelancer_accepted, interview_count, processes,
+        max_candidates, manager_name, manager_email,
+        company_type, source, ai_processed, status,
+        created_at, registered_at
+    ) VALUES (
+        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12,
+        $13, $14, $15, $16, $17, $18, $19, $20, $21, $22,
+        $23, $24, '他社', 'mail_import', true, '募集中',
+        $25, $25
+    )
+    RETURNING id
+"""
+
+# 插入项目并在同一语句中回写来源邮件的 project_id 与处理状态（省去一次往返）
+INSERT_PROJECT_AND_LINK_EMAIL_SQL = f"""
+    WITH ins AS ({INSERT_PROJECT_SQL}),
+    upd AS (
+        UPDATE receive_emails
+        SET project_id = (SELECT id FROM ins),
+            processing_status = $26,
+            ai_extraction_status = 'completed'
+        WHERE id = $27
+    )
+    SELECT id FROM ins
+"""
+
 
 class ProjectRepository:
     """项目数据库操作类"""
@@ -19,52 +53,23 @@ class ProjectRepository:
         tenant_id: str,
         project_data: ProjectStructured,
         sender_email: str,
+        created_at: Optional[datetime] = None,
+        email_id: Optional[str] = None,
     ) -> Optional[str]:
-        """保存项目信息到数据库"""
+        """保存项目信息到数据库
+
+        指定 email_id 时，在同一条语句中将邮件标记为已处理并关联项目
+        """
+        if email_id:
+            sql = INSERT_PROJECT_AND_LINK_EMAIL_SQL
+            link_args = (ProcessingStatus.PROCESSED.value, email_id)
+        else:
+            sql, link_args = INSERT_PROJECT_SQL, ()
+
         async with db_manager.get_transaction() as conn:
             try:
-                # 处理开始日期
-                start_date_value = None
-                if project_data.start_date:
-                    try:
-                        start_date_value = datetime.strptime(
-                            project_data.start_date, "%Y-%m-%d"
-                        ).date()
-                    except ValueError:
-                        start_date_value = date.today()
-                else:
-                    start_date_value = date.today()
-
-                # 处理应募截止日期
-                application_deadline_value = None
-                if project_data.application_deadline:
-                    try:
-                        application_deadline_value = datetime.strptime(
-                            project_data.application_deadline, "%Y-%m-%d"
-                        ).date()
-                    except ValueError:
-                        pass
-
                 project_id = await conn.fetchval(
-                    """
-                    INSERT INTO projects (
-                        tenant_id, title, client_company, partner_company,
-                        description, detail_description, skills, key_technologies,
-                        location, work_type, start_date, duration,
-                        application_deadline, budget, desired_budget,
-                        japanese_level, experience, foreigner_accepted,
-                        freelancer_accepted, interview_count, processes,
-                        max_candidates, manager_name, manager_email,
-                        company_type, source, ai_processed, status, 
-                        created_at, registered_at
-                    ) VALUES (
-                        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12,
-                        $13, $14, $15, $16, $17, $18, $19, $20, $21, $22,
-                        $23, $24, '他社', 'mail_import', true, '募集中',
-                        $25, $25
-                    )
-                    RETURNING id
-                    """,
+                    sql,
                     tenant_id,
                     project_data.title,
                     project_data.client_company,
@@ -75,9 +80,9 @@ class ProjectRepository:
                     project_data.key_technologies,
                     project_data.location,
                     project_data.work_type,
-                    start_date_value,
+                    project_data.start_date or date.today(),
                     project_data.duration,
-                    application_deadline_value,
+                    project_data.application_deadline,
                     project_data.budget,
                     project_data.desired_budget,
                     project_data.japanese_level,
@@ -89,7 +94,8 @@ class ProjectRepository:
                     project_data.max_candidates or 5,
                     project_data.manager_name,
                     project_data.manager_email or sender_email,
-                    datetime.now(),
+                    created_at or datetime.now(),
+                    *link_args,
                 )
 
                 logger.info(f"Project saved successfully: {project_id}")
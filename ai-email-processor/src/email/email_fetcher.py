@@ -1,10 +1,13 @@
 # src/email/email_fetcher.py
 """邮件获取器 - 负责从IMAP服务器获取邮件"""
 
+import asyncio
 import imaplib
 import email
 import logging
-from typing import List
+from datetime import datetime
+from email import policy
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 from src.models.data_models import SMTPSettings
 from src.email.email_parser import EmailParser
@@ -17,74 +20,180 @@ class EmailFetcher:
 
     def __init__(self):
         self.email_parser = EmailParser()
+        # 按邮箱设置缓存的IMAP连接（跨调度周期复用，省去TLS握手和登录）
+        self._connections: Dict[str, Tuple[tuple, imaplib.IMAP4]] = {}
+
+    @staticmethod
+    def _connect(settings: SMTPSettings) -> imaplib.IMAP4:
+        """建立IMAP连接并选中收件箱（阻塞调用，需在线程中执行）"""
+        if settings.security_protocol == "SSL":
+            mail = imaplib.IMAP4_SSL(settings.imap_host, settings.imap_port)
+        else:
+            mail = imaplib.IMAP4(settings.imap_host, settings.imap_port)
+
+        mail.login(settings.smtp_username, settings.smtp_password)
+        mail.select("INBOX")
+        return mail
+
+    @staticmethod
+    def _connection_key(settings: SMTPSettings) -> tuple:
+        """连接参数，变更后（如密码更新）需重新登录"""
+        return (
+            settings.imap_host,
+            settings.imap_port,
+            settings.security_protocol,
+            settings.smtp_username,
+            settings.smtp_password,
+        )
+
+    @staticmethod
+    def _is_alive(mail: imaplib.IMAP4) -> bool:
+        """用 NOOP 检查缓存的连接是否仍可用"""
+        try:
+            return mail.noop()[0] == "OK"
+        except Exception:
+            return False
+
+    @staticmethod
+    def _safe_logout(mail: imaplib.IMAP4):
+        """退出连接，忽略已断开等错误"""
+        try:
+            mail.logout()
+        except Exception:
+            pass
+
+    @staticmethod
+    async def _run_blocking(func, *args):
+        """在线程中执行 imaplib 阻塞调用
+
+        线程中的调用无法中断：任务被取消时先等待该调用结束再传播取消，
+        避免调用方随后 logout 时与仍在进行的调用并发使用同一连接
+        """
+        future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            await asyncio.wait({future})
+            if not future.cancelled():
+                future.exception()  # 取走异常，避免未检索异常的警告
+            raise
+
+    async def _get_connection(self, settings: SMTPSettings) -> imaplib.IMAP4:
+        """取出缓存的可用连接，没有或已失效时重新连接"""
+        cached = self._connections.pop(settings.id, None)
+        if cached:
+            key, mail = cached
+            if key == self._connection_key(settings) and await self._run_blocking(
+                self._is_alive, mail
+            ):
+                return mail
+            await self._run_blocking(self._safe_logout, mail)
+
+        return await self._run_blocking(self._connect, settings)
+
+    async def close_all(self):
+        """关闭所有缓存的IMAP连接"""
+        connections = list(self._connections.values())
+        self._connections.clear()
+        for _, mail in connections:
+            await asyncio.to_thread(self._safe_logout, mail)
 
     async def fetch_emails(self, settings: SMTPSettings) -> List[dict]:
-        """从邮件服务器获取新邮件"""
+        """从邮件服务器获取全部新邮件"""
         emails = []
+        async for batch in self.iter_email_batches(settings):
+            emails.extend(batch)
+        return emails
 
-        try:
-            # IMAP连接
-            if settings.security_protocol == "SSL":
-                mail = imaplib.IMAP4_SSL(settings.imap_host, settings.imap_port)
-            else:
-                mail = imaplib.IMAP4(settings.imap_host, settings.imap_port)
+    async def iter_email_batches(
+        self, settings: SMTPSettings, batch_size: int = 50
+    ) -> AsyncIterator[List[dict]]:
+        """逐批获取新邮件：每凑满 batch_size 封即交给调用方，调用方处理期间可继续获取
 
-            mail.login(settings.smtp_username, settings.smtp_password)
-            mail.select("INBOX")
+        imaplib 的阻塞调用放到线程中执行，不阻塞事件循环
+        """
+        mail = None
+        fetched_count = 0
+
+        try:
+            # IMAP连接（优先复用上次的连接）
+            mail = await self._get_connection(settings)
 
             # 搜索未读邮件
-            _, messages = mail.search(None, "UNSEEN")
+            _, messages = await self._run_blocking(mail.search, None, "UNSEEN")
+            # 本次获取的邮件共用同一接收时间戳
+            fetched_at = datetime.now()
+            msg_nums = messages[0].split() if messages[0] else []
+
+            logger.info(f"Found {len(msg_nums)} unread emails")
+
+            batch = []
+            for msg_num in msg_nums:
+                email_data = await self._fetch_message(mail, msg_num, fetched_at)
+                if email_data is None:
+                    continue
+
+                batch.append(email_data)
+                if len(batch) >= batch_size:
+                    fetched_count += len(batch)
+                    yield batch
+                    batch = []
 
+            if batch:
+                fetched_count += len(batch)
+                yield batch
+
+            # 保留连接供下次获取复用
+            self._connections[settings.id] = (self._connection_key(settings), mail)
+            mail = None
             logger.info(
-                f"Found {len(messages[0].split()) if messages[0] else 0} unread emails"
+                f"Successfully fetched {fetched_count} emails from {settings.imap_host}"
             )
 
-            for msg_num in messages[0].split():
-                try:
-                    _, msg = mail.fetch(msg_num, "(RFC822)")
+        except Exception as e:
+            logger.error(f"Error fetching emails from {settings.imap_host}: {e}")
 
-                    for response in msg:
-                        if isinstance(response, tuple):
-                            email_message = email.message_from_bytes(response[1])
+        finally:
+            # 出错或调用方中途停止时不复用连接
+            if mail is not None:
+                await self._run_blocking(self._safe_logout, mail)
 
-                            # 解析邮件内容
-                            email_data = await self.email_parser.parse_email(
-                                email_message
-                            )
-                            emails.append(email_data)
+    async def _fetch_message(
+        self, mail: imaplib.IMAP4, msg_num: bytes, fetched_at: datetime
+    ) -> Optional[dict]:
+        """获取并解析单封邮件，成功后标记为已读"""
+        try:
+            _, msg = await self._run_blocking(mail.fetch, msg_num, "(RFC822)")
 
-                            # 标记为已读
-                            mail.store(msg_num, "+FLAGS", "\\Seen")
+            for response in msg:
+                if isinstance(response, tuple):
+                    email_message = email.message_from_bytes(
+                        response[1], policy=policy.default
+                    )
 
-                            logger.info(
-                                f"Successfully fetched email: {email_data.get('subject', 'No Subject')}"
-                            )
+                    # 解析邮件内容
+                    email_data = await self.email_parser.parse_email(
+                        email_message, fetched_at
+                    )
 
-                except Exception as e:
-                    logger.error(f"Error processing email {msg_num}: {e}")
-                    continue
+                    # 标记为已读
+                    await self._run_blocking(mail.store, msg_num, "+FLAGS", "\\Seen")
 
-            mail.logout()
-            logger.info(
-                f"Successfully fetched {len(emails)} emails from {settings.imap_host}"
-            )
+                    logger.info(
+                        f"Successfully fetched email: {email_data.get('subject', 'No Subject')}"
+                    )
+                    return email_data
 
         except Exception as e:
-            logger.error(f"Error fetching emails from {settings.imap_host}: {e}")
+            logger.error(f"Error processing email {msg_num}: {e}")
 
-        return emails
+        return None
 
     async def test_connection(self, settings: SMTPSettings) -> bool:
         """测试IMAP连接"""
         try:
-            if settings.security_protocol == "SSL":
-                mail = imaplib.IMAP4_SSL(settings.imap_host, settings.imap_port)
-            else:
-                mail = imaplib.IMAP4(settings.imap_host, settings.imap_port)
-
-            mail.login(settings.smtp_username, settings.smtp_password)
-            mail.select("INBOX")
-            mail.logout()
+            mail = await asyncio.to_thread(self._connect, settings)
+            await asyncio.to_thread(mail.logout)
 
             logger.info(f"IMAP connection test successful for {settings.imap_host}")
             return True
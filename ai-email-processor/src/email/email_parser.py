@@ -2,20 +2,27 @@
 """邮件解析器 - 负责解析邮件内容和附件"""
 
 import logging
+import re
 from datetime import datetime
 from email.header import decode_header
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from src.models.data_models import EmailData, AttachmentInfo
+from src.resume_files import is_resume_candidate
 
 logger = logging.getLogger(__name__)
 
+# "显示名 <地址>" 形式的发件人字段
+_ADDR_RE = re.compile(r"^\s*(.*?)\s*<([^<>]+)>\s*$")
+
 
 class EmailParser:
     """邮件解析器"""
 
-    async def parse_email(self, msg) -> Dict:
-        """解析邮件消息"""
+    async def parse_email(self, msg, received_at: Optional[datetime] = None) -> Dict:
+        """解析邮件消息（received_at 由调用方按批次传入）"""
+        received_at = received_at or datetime.now()
+
         try:
             # 解析邮件头信息
             subject = self._decode_header(msg.get("Subject", ""))
@@ -37,7 +44,7 @@ class EmailParser:
                 body_text=body_text,
                 body_html=body_html,
                 attachments=attachments,
-                received_at=datetime.now(),
+                received_at=received_at,
                 recipient_to=recipient_to,
                 recipient_cc=recipient_cc,
                 recipient_bcc=recipient_bcc,
@@ -56,7 +63,7 @@ class EmailParser:
                 "body_text": "",
                 "body_html": "",
                 "attachments": [],
-                "received_at": datetime.now(),
+                "received_at": received_at,
                 "recipient_to": [],
                 "recipient_cc": [],
                 "recipient_bcc": [],
@@ -67,6 +74,10 @@ class EmailParser:
         if not header_value:
             return ""
 
+        # 快速路径：不含 RFC 2047 编码字（policy.default 解析的头部已是解码后的文本）
+        if "=?" not in header_value:
+            return str(header_value)
+
         try:
             decoded_parts = decode_header(header_value)
             result = ""
@@ -74,7 +85,7 @@ class EmailParser:
             for part_content, part_encoding in decoded_parts:
                 if isinstance(part_content, bytes):
                     if part_encoding:
-                        result += part_content.decode(part_encoding)
+                        result += part_content.decode(part_encoding, errors="replace")
                     else:
                         # 尝试常见编码
                         for encoding in ["utf-8", "gbk", "shift_jis", "iso-2022-jp"]:
@@ -101,11 +112,11 @@ class EmailParser:
         sender_email = ""
 
         try:
-            if "<" in sender_field and ">" in sender_field:
-                sender_name = sender_field.split("<")[0].strip()
-                sender_email = sender_field.split("<")[1].replace(">", "").strip()
+            match = _ADDR_RE.match(sender_field)
+            if match:
+                sender_email = match.group(2).strip()
                 # 解码发件人姓名
-                sender_name = self._decode_header(sender_name)
+                sender_name = self._decode_header(match.group(1))
             else:
                 sender_email = sender_field.strip()
 
@@ -129,29 +140,32 @@ class EmailParser:
             return [recipients_field]
 
     async def _parse_content(self, msg) -> tuple[str, str, List[Dict]]:
-        """解析邮件内容和附件"""
+        """解析邮件内容和附件（msg 需以 policy.default 解析为 EmailMessage）"""
         body_text = ""
         body_html = ""
         attachments = []
 
         try:
-            for part in msg.walk():
-                content_type = part.get_content_type()
-                content_disposition = str(part.get("Content-Disposition", ""))
+            # 由标准库按结构定位正文部分
+            text_part = msg.get_body(preferencelist=("plain",))
+            if text_part is not None:
+                body_text = self._decode_content(text_part)
 
-                if "attachment" in content_disposition:
-                    # 处理附件
-                    attachment = await self._parse_attachment(part)
-                    if attachment:
-                        attachments.append(attachment)
+            html_part = msg.get_body(preferencelist=("html",))
+            if html_part is not None:
+                body_html = self._decode_content(html_part)
 
-                elif content_type == "text/plain" and not body_text:
-                    # 处理纯文本内容
-                    body_text = self._decode_content(part)
+            # 附件可能嵌套在 multipart/alternative > multipart/mixed 或转发的
+            # message/rfc822 内，iter_attachments 只看顶层子部分，因此遍历全部部分
+            for part in msg.walk():
+                if part is text_part or part is html_part:
+                    continue
+                if part.get_content_disposition() != "attachment":
+                    continue
 
-                elif content_type == "text/html" and not body_html:
-                    # 处理HTML内容
-                    body_html = self._decode_content(part)
+                attachment = await self._parse_attachment(part)
+                if attachment:
+                    attachments.append(attachment)
 
         except Exception as e:
             logger.error(f"Error parsing email content: {e}")
@@ -187,24 +201,31 @@ class EmailParser:
             # 解码文件名
             decoded_filename = self._decode_header(filename)
 
-            # 获取附件内容
-            file_content = part.get_payload(decode=True)
-            if not file_content:
-                return None
-
             # 创建附件信息
             attachment_info = {
                 "filename": decoded_filename,
                 "original_filename": filename,
                 "content_type": part.get_content_type(),
-                "size": len(file_content),
-                "content": file_content,  # 二进制内容
             }
 
+            if is_resume_candidate(decoded_filename):
+                # 可能的简历文件：解码二进制内容供后续简历解析使用
+                file_content = part.get_payload(decode=True)
+                if not file_content:
+                    return None
+                attachment_info["size"] = len(file_content)
+                attachment_info["content"] = file_content  # 二进制内容
+            else:
+                # 其他附件只记录元信息，按编码后长度估算大小，不解码内容
+                size = self._estimate_decoded_size(part)
+                if not size:
+                    return None
+                attachment_info["size"] = size
+
             logger.info(
                 f"Parsed attachment: {decoded_filename} "
                 f"({'same' if filename == decoded_filename else f'original: {filename}'}) "
-                f"({len(file_content)} bytes)"
+                f"({attachment_info['size']} bytes)"
             )
 
             return attachment_info
@@ -213,6 +234,27 @@ class EmailParser:
             logger.error(f"Error parsing attachment: {e}")
             return None
 
+    def _estimate_decoded_size(self, part) -> int:
+        """根据编码后的载荷长度估算附件解码后的字节数"""
+        payload = part.get_payload()
+        if not isinstance(payload, str):
+            # 嵌套消息等非字符串载荷，退回到实际解码
+            return len(part.get_payload(decode=True) or b"")
+
+        encoding = str(part.get("Content-Transfer-Encoding", "")).strip().lower()
+        if encoding != "base64":
+            return len(payload)
+
+        stripped = payload.rstrip()
+        data_length = (
+            len(stripped)
+            - stripped.count("\n")
+            - stripped.count("\r")
+            - stripped.count(" ")
+        )
+        padding = len(stripped) - len(stripped.rstrip("="))
+        return max(data_length * 3 // 4 - padding, 0)
+
 
 # 全局邮件解析器实例
 email_parser = EmailParser()
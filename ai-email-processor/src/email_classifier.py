@@ -1,16 +1,21 @@
 # src/email_classifier.py
 """邮件分类模块 - 分离式AI服务版本"""
 
+import asyncio
 import re
 import json
 import logging
-from typing import Dict, List, Tuple
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
 import httpx
 from openai import AsyncOpenAI
 from src.no_auth_processor import NoAuthCustomAPIProcessor
+from src.http_client import create_api_client
+from src import fast_json
 from src.config import Config
+from src.cache_utils import LRUCache, content_digest
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +27,25 @@ class EmailType(str, Enum):
     UNCLASSIFIED = "unclassified"
 
 
+@dataclass(frozen=True)
+class NormalizedEmail:
+    """分类过程中复用的小写化邮件字段（每封邮件只转换一次）"""
+
+    subject: str
+    body_text: str
+    sender_email: str
+    sender_name: str
+
+    @classmethod
+    def from_email_data(cls, email_data: Dict) -> "NormalizedEmail":
+        return cls(
+            subject=email_data.get("subject", "").lower(),
+            body_text=email_data.get("body_text", "").lower(),
+            sender_email=email_data.get("sender_email", "").lower(),
+            sender_name=email_data.get("sender_name", "").lower(),
+        )
+
+
 class EmailClassifier:
     """邮件分类器 - 分离式AI服务版本"""
 
@@ -66,14 +90,7 @@ class EmailClassifier:
             api_base_url = self.ai_config.get("api_base_url")
             timeout = self.ai_config.get("timeout", 120.0)
             if api_key and api_base_url:
-                self.ai_client = httpx.AsyncClient(
-                    base_url=api_base_url,
-                    headers={
-                        "Authorization": f"Bearer {api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    timeout=timeout,
-                )
+                self.ai_client = create_api_client(api_base_url, api_key, timeout)
                 logger.info("DeepSeek 分类客户端初始化成功")
         elif provider_name == "custom":
             api_base_url = self.ai_config.get("api_base_url")
@@ -81,14 +98,7 @@ class EmailClassifier:
 
             if api_base_url:
                 if require_auth and api_key:
-                    self.ai_client = httpx.AsyncClient(
-                        base_url=api_base_url,
-                        headers={
-                            "Authorization": f"Bearer {api_key}",
-                            "Content-Type": "application/json",
-                        },
-                        timeout=timeout,
-                    )
+                    self.ai_client = create_api_client(api_base_url, api_key, timeout)
                     logger.info("Custom API 分类客户端初始化成功 (认证)")
                 elif not require_auth:
                     default_model = self.ai_config.get("default_model", "default")
@@ -141,13 +151,8 @@ class EmailClassifier:
                 api_base_url = fallback_config.get("api_base_url")
                 timeout = fallback_config.get("timeout", 120.0)
                 if api_key and api_base_url:
-                    self.fallback_client = httpx.AsyncClient(
-                        base_url=api_base_url,
-                        headers={
-                            "Authorization": f"Bearer {api_key}",
-                            "Content-Type": "application/json",
-                        },
-                        timeout=timeout,
+                    self.fallback_client = create_api_client(
+                        api_base_url, api_key, timeout
                     )
                     logger.info("DeepSeek 后备分类客户端初始化成功")
             elif fallback_provider in ["custom", "custom_no_auth"]:
@@ -166,13 +171,8 @@ class EmailClassifier:
                             f"{fallback_provider} 后备分类客户端初始化成功 (无认证)"
                         )
                     elif require_auth and api_key:
-                        self.fallback_client = httpx.AsyncClient(
-                            base_url=api_base_url,
-                            headers={
-                                "Authorization": f"Bearer {api_key}",
-                                "Content-Type": "application/json",
-                            },
-                            timeout=timeout,
+                        self.fallback_client = create_api_client(
+                            api_base_url, api_key, timeout
                         )
                         logger.info(
                             f"{fallback_provider} 后备分类客户端初始化成功 (认证)"
@@ -325,6 +325,59 @@ class EmailClassifier:
             },
         }
 
+        # 智能内容提取结果缓存（分类与后续数据提取阶段对同一邮件各调用一次）
+        self._content_extraction_cache = LRUCache(256)
+
+        # 分类结果缓存：回复链/转发模板等内容相同的邮件无需重复分析和AI调用
+        self._classification_cache = LRUCache(Config.CLASSIFICATION["cache_size"])
+
+        # 规则评分足够明确时跳过AI分类的阈值
+        self.ai_skip_score_threshold = Config.CLASSIFICATION["ai_skip_score_threshold"]
+
+        # 退信/系统通知邮件：命中即归为 other，无需内容分析和AI调用
+        self.system_notification_subject_pattern = re.compile(
+            r"delivery status notification|undelivered mail|undeliverable"
+            r"|mail delivery (?:failed|failure|subsystem)|returned mail"
+            r"|配信不能|配信エラー|不達",
+            re.IGNORECASE,
+        )
+        self.system_notification_sender_pattern = re.compile(
+            r"^(?:mailer-daemon|postmaster)@"
+        )
+
+        # 附件文件名模式（每类合并为一个预编译的正则）
+        self.attachment_engineer_pattern = re.compile(
+            "|".join(["履歴書", "職務経歴", "スキルシート", "resume", "cv", "profile"])
+        )
+        self.attachment_project_pattern = re.compile(
+            "|".join(["案件", "project", "proposal", "詳細", "仕様", "要件"])
+        )
+
+        # 简历文件扩展名（str.endswith 可直接接受元组）
+        self.resume_extensions = (".docx", ".doc", ".pdf", ".xlsx", ".xls")
+        self.resume_document_extensions = (".docx", ".doc", ".pdf")
+
+        # 智能内容提取时用于定位重要段落的关键词
+        self.important_keywords = (
+            "案件",
+            "プロジェクト",
+            "開発",
+            "必須スキル",
+            "単価",
+            "期間",
+            "場所",
+            "エンジニア",
+            "履歴書",
+            "経験",
+            "希望",
+            "技術者",
+            "スキル",
+            "資格",
+            "要員",
+            "人材",
+            "ご紹介",
+        )
+
         # 排除关键词（垃圾邮件识别）
         self.exclusion_keywords = [
             "広告",
@@ -415,10 +468,14 @@ class EmailClassifier:
 
         return analysis
 
-    def analyze_sender_info(self, email_data: Dict) -> Dict:
+    def analyze_sender_info(
+        self, email_data: Dict, normalized: Optional[NormalizedEmail] = None
+    ) -> Dict:
         """分析发件人信息"""
-        sender_email = email_data.get("sender_email", "").lower()
-        sender_name = email_data.get("sender_name", "").lower()
+        if normalized is None:
+            normalized = NormalizedEmail.from_email_data(email_data)
+        sender_email = normalized.sender_email
+        sender_name = normalized.sender_name
 
         analysis = {"domain_type": "unknown", "confidence": 0.0, "indicators": []}
 
@@ -459,52 +516,29 @@ class EmailClassifier:
         if not attachments:
             return analysis
 
-        engineer_patterns = [
-            r"履歴書",
-            r"職務経歴",
-            r"スキルシート",
-            r"resume",
-            r"cv",
-            r"profile",
-        ]
-        project_patterns = [r"案件", r"project", r"proposal", r"詳細", r"仕様", r"要件"]
-
-        # 简历文件扩展名
-        resume_extensions = [".docx", ".doc", ".pdf", ".xlsx", ".xls"]
-
         for attachment in attachments:
             filename = attachment.get("filename", "").lower()
+            is_engineer_file = bool(self.attachment_engineer_pattern.search(filename))
 
-            # 检查是否为简历文件
-            is_resume_file = False
-            for ext in resume_extensions:
-                if filename.endswith(ext):
-                    # 检查文件名是否包含简历相关关键词
-                    for pattern in engineer_patterns:
-                        if re.search(pattern, filename):
-                            analysis["resume_files"].append(attachment)
-                            is_resume_file = True
-                            break
-
-                    # 如果文件扩展名是简历格式，也可能是简历
-                    if not is_resume_file and ext in [".docx", ".doc", ".pdf"]:
-                        analysis["resume_files"].append(attachment)
-                        is_resume_file = True
+            # 检查是否为简历文件：简历扩展名且文件名含简历关键词，
+            # 或扩展名本身就是常见简历格式
+            if filename.endswith(self.resume_extensions) and (
+                is_engineer_file or filename.endswith(self.resume_document_extensions)
+            ):
+                analysis["resume_files"].append(attachment)
 
             # 检查工程师相关附件
-            for pattern in engineer_patterns:
-                if re.search(pattern, filename):
-                    analysis["engineer_indicators"].append(filename)
-                    analysis["confidence"] = 0.9
-                    analysis["strong_type"] = "engineer_related"
+            if is_engineer_file:
+                analysis["engineer_indicators"].append(filename)
+                analysis["confidence"] = 0.9
+                analysis["strong_type"] = "engineer_related"
 
             # 检查项目相关附件
-            for pattern in project_patterns:
-                if re.search(pattern, filename):
-                    analysis["project_indicators"].append(filename)
-                    if analysis["confidence"] < 0.8:
-                        analysis["confidence"] = 0.8
-                        analysis["strong_type"] = "project_related"
+            if self.attachment_project_pattern.search(filename):
+                analysis["project_indicators"].append(filename)
+                if analysis["confidence"] < 0.8:
+                    analysis["confidence"] = 0.8
+                    analysis["strong_type"] = "project_related"
 
         # 如果有简历文件，强烈倾向于engineer_related
         if analysis["resume_files"]:
@@ -515,11 +549,24 @@ class EmailClassifier:
         return analysis
 
     def smart_content_extraction(self, email_data: Dict) -> str:
-        """智能内容提取"""
-        subject = email_data.get("subject", "")
+        """智能内容提取（结果按正文摘要缓存）"""
         body_text = email_data.get("body_text", "")
         body_html = email_data.get("body_html", "")
 
+        # 提取结果只取决于纯文本正文（无纯文本时取HTML）
+        if body_text:
+            cache_key = content_digest("text", body_text)
+        else:
+            cache_key = content_digest("html", body_html)
+        extracted_content = self._content_extraction_cache.get(cache_key)
+        if extracted_content is None:
+            extracted_content = self._extract_content(body_text, body_html)
+            self._content_extraction_cache.set(cache_key, extracted_content)
+
+        return extracted_content
+
+    def _extract_content(self, body_text: str, body_html: str) -> str:
+        """按头部、重要段落和末尾截取正文"""
         # 如果没有纯文本，尝试从HTML提取
         if not body_text and body_html:
             body_text = re.sub(r"<[^>]+>", "", body_html)
@@ -530,60 +577,58 @@ class EmailClassifier:
         else:
             head_part = body_text[:800]
 
-            # 查找包含关键词的重要段落
-            important_keywords = [
-                "案件",
-                "プロジェクト",
-                "開発",
-                "必須スキル",
-                "単価",
-                "期間",
-                "場所",
-                "エンジニア",
-                "履歴書",
-                "経験",
-                "希望",
-                "技術者",
-                "スキル",
-                "資格",
-                "要員",
-                "人材",
-                "ご紹介",
-            ]
-
+            # 查找包含关键词的重要段落（按行偏移扫描，不生成整个行列表；只需前两段）
             important_parts = []
-            lines = body_text.split("\n")
-
-            for i, line in enumerate(lines):
-                line_score = sum(1 for keyword in important_keywords if keyword in line)
+            text_length = len(body_text)
+            prev_start = 0
+            start = 0
+
+            while len(important_parts) < 2:
+                end = body_text.find("\n", start)
+                if end == -1:
+                    end = text_length
+
+                line_score = sum(
+                    1
+                    for keyword in self.important_keywords
+                    if body_text.find(keyword, start, end) != -1
+                )
                 if line_score >= 2:
-                    start_idx = max(0, i - 1)
-                    end_idx = min(len(lines), i + 2)
-                    context = "\n".join(lines[start_idx:end_idx])
-                    important_parts.append(context)
+                    # 上下文：前一行到后一行
+                    if end == text_length:
+                        context_end = text_length
+                    else:
+                        context_end = body_text.find("\n", end + 1)
+                        if context_end == -1:
+                            context_end = text_length
+                    important_parts.append(body_text[prev_start:context_end])
+
+                if end == text_length:
+                    break
+                prev_start = start
+                start = end + 1
 
             tail_part = body_text[-300:] if len(body_text) > 300 else ""
 
             extracted_content = head_part
             if important_parts:
-                extracted_content += "\n\n【重要段落】\n" + "\n".join(
-                    important_parts[:2]
-                )
+                extracted_content += "\n\n【重要段落】\n" + "\n".join(important_parts)
             if tail_part:
                 extracted_content += "\n\n【末尾部分】\n" + tail_part
 
         return extracted_content
 
     def calculate_keyword_score(
-        self, text: str, email_type: str
+        self, text: str, email_type: str, text_lower: Optional[str] = None
     ) -> Tuple[float, List[str]]:
-        """计算关键词得分 - 改进版本"""
+        """计算关键词得分 - 改进版本（text_lower 为调用方已小写化的文本）"""
         if email_type not in self.keywords:
             return 0.0, []
 
         found_keywords = []
         score = 0.0
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
 
         keywords_dict = self.keywords[email_type]
 
@@ -607,132 +652,224 @@ class EmailClassifier:
 
         return score, found_keywords
 
-    def check_spam_indicators(self, email_data: Dict) -> bool:
+    def check_spam_indicators(
+        self, email_data: Dict, normalized: Optional[NormalizedEmail] = None
+    ) -> bool:
         """检查垃圾邮件指标"""
-        subject = email_data.get("subject", "").lower()
-        body_text = email_data.get("body_text", "").lower()
-        sender_email = email_data.get("sender_email", "").lower()
+        if normalized is None:
+            normalized = NormalizedEmail.from_email_data(email_data)
+        sender_email = normalized.sender_email
 
-        combined_text = f"{subject} {body_text}"
+        combined_text = f"{normalized.subject} {normalized.body_text}"
 
-        spam_count = sum(
-            1 for keyword in self.exclusion_keywords if keyword in combined_text
-        )
-        sender_suspicious = any(
+        # 达到阈值即可判定，无需扫描剩余关键词
+        spam_count = 0
+        for keyword in self.exclusion_keywords:
+            if keyword in combined_text:
+                spam_count += 1
+                if spam_count >= 2:
+                    return True
+
+        return any(
             pattern in sender_email for pattern in self.sender_patterns["suspicious"]
         )
 
-        return spam_count >= 2 or sender_suspicious
+    def quick_classify(
+        self, email_data: Dict, normalized: Optional[NormalizedEmail] = None
+    ) -> Optional[EmailType]:
+        """廉价的预分类：退信/系统通知直接判定为 other，无法判定时返回 None"""
+        if normalized is None:
+            normalized = NormalizedEmail.from_email_data(email_data)
 
-    async def classify_email(self, email_data: Dict) -> EmailType:
-        """邮件分类主方法 - 分离式AI版本"""
-        try:
-            logger.info(f"开始分类邮件: {email_data.get('subject', 'No Subject')}")
+        if self.system_notification_sender_pattern.match(
+            normalized.sender_email
+        ) or self.system_notification_subject_pattern.search(normalized.subject):
+            return EmailType.OTHER
 
-            # 1. 垃圾邮件检测
-            if self.check_spam_indicators(email_data):
-                logger.info("检测到垃圾邮件特征，分类为unclassified")
-                return EmailType.UNCLASSIFIED
+        return None
 
-            # 2. 结构分析 - 这是关键改进
-            structure_analysis = self.analyze_email_structure(email_data)
-            logger.info(f"结构分析结果: {structure_analysis}")
+    def _classification_cache_key(self, email_data: Dict) -> str:
+        """分类结果缓存键：覆盖分类所依据的全部字段"""
+        attachment_names = "\n".join(
+            attachment.get("filename") or ""
+            for attachment in email_data.get("attachments") or []
+        )
+        return content_digest(
+            email_data.get("subject", ""),
+            email_data.get("body_text", ""),
+            email_data.get("body_html", ""),
+            email_data.get("sender_email", ""),
+            email_data.get("sender_name", ""),
+            attachment_names,
+        )
 
-            # 3. 决定性判断 - 如果结构分析已经确定类型，直接返回
-            if structure_analysis["definitive_type"]:
+    async def classify_email(self, email_data: Dict) -> EmailType:
+        """邮件分类主方法 - 分离式AI版本（内容相同的邮件复用缓存结果）"""
+        try:
+            cache_key = self._classification_cache_key(email_data)
+            cached_type = self._classification_cache.get(cache_key)
+            if cached_type is not None:
                 logger.info(
-                    f"结构分析确定类型: {structure_analysis['definitive_type']}, "
-                    f"置信度: {structure_analysis['confidence']:.2f}"
+                    f"分类缓存命中: {email_data.get('subject', 'No Subject')} "
+                    f"-> {cached_type.value}"
                 )
-                return EmailType(structure_analysis["definitive_type"])
+                return cached_type
 
-            # 4. 附件分析
-            attachment_analysis = self.analyze_attachments(email_data)
-            if attachment_analysis["confidence"] > 0.8:
-                logger.info(
-                    f"强附件指标检测: {attachment_analysis['strong_type']}, "
-                    f"置信度: {attachment_analysis['confidence']:.2f}"
-                )
-                return EmailType(attachment_analysis["strong_type"])
+            email_type = await self._classify_email_uncached(email_data)
+
+        except Exception as e:
+            logger.error(f"邮件分类过程出错: {e}")
+            return EmailType.UNCLASSIFIED
+
+        # UNCLASSIFIED 可能来自AI服务全部失败等暂时性原因，不写入缓存，下次重新分类
+        if email_type is not EmailType.UNCLASSIFIED:
+            self._classification_cache.set(cache_key, email_type)
+        return email_type
 
-            # 5. 智能内容分析
-            extracted_content = self.smart_content_extraction(email_data)
+    async def _classify_email_uncached(self, email_data: Dict) -> EmailType:
+        """执行规则分析与AI分类"""
+        logger.info(f"开始分类邮件: {email_data.get('subject', 'No Subject')}")
 
-            # 关键词分析
-            project_score, project_keywords = self.calculate_keyword_score(
-                extracted_content, "project_related"
+        # 小写化字段只计算一次，供各分析步骤复用
+        normalized = NormalizedEmail.from_email_data(email_data)
+
+        # 1. 垃圾邮件检测
+        if self.check_spam_indicators(email_data, normalized):
+            logger.info("检测到垃圾邮件特征，分类为unclassified")
+            return EmailType.UNCLASSIFIED
+
+        # 预分类：退信/系统通知无需后续分析
+        quick_type = self.quick_classify(email_data, normalized)
+        if quick_type:
+            logger.info(f"预分类确定类型: {quick_type.value}")
+            return quick_type
+
+        # 2. 结构分析 - 这是关键改进
+        structure_analysis = self.analyze_email_structure(email_data)
+        logger.debug("结构分析结果: %s", structure_analysis)
+
+        # 3. 决定性判断 - 如果结构分析已经确定类型，直接返回
+        if structure_analysis["definitive_type"]:
+            logger.info(
+                f"结构分析确定类型: {structure_analysis['definitive_type']}, "
+                f"置信度: {structure_analysis['confidence']:.2f}"
             )
-            engineer_score, engineer_keywords = self.calculate_keyword_score(
-                extracted_content, "engineer_related"
+            return EmailType(structure_analysis["definitive_type"])
+
+        # 4. 附件分析
+        attachment_analysis = self.analyze_attachments(email_data)
+        if attachment_analysis["confidence"] > 0.8:
+            logger.info(
+                f"强附件指标检测: {attachment_analysis['strong_type']}, "
+                f"置信度: {attachment_analysis['confidence']:.2f}"
             )
+            return EmailType(attachment_analysis["strong_type"])
 
-            # 发件人分析
-            sender_analysis = self.analyze_sender_info(email_data)
+        # 5. 智能内容分析
+        extracted_content = self.smart_content_extraction(email_data)
+        extracted_lower = extracted_content.lower()
 
-            # 6. 综合评分 - 考虑结构分析的权重
-            final_engineer_score = (
-                engineer_score
-                + structure_analysis["personal_info_count"] * 3  # 个人信息每项+3分
-                + structure_analysis["ultra_engineer_score"] * 0.5  # 超强指示符额外加分
-            )
+        # 关键词分析
+        project_score, project_keywords = self.calculate_keyword_score(
+            extracted_content, "project_related", extracted_lower
+        )
+        engineer_score, engineer_keywords = self.calculate_keyword_score(
+            extracted_content, "engineer_related", extracted_lower
+        )
+
+        # 发件人分析
+        sender_analysis = self.analyze_sender_info(email_data, normalized)
+
+        # 6. 综合评分 - 考虑结构分析的权重
+        final_engineer_score = (
+            engineer_score
+            + structure_analysis["personal_info_count"] * 3  # 个人信息每项+3分
+            + structure_analysis["ultra_engineer_score"] * 0.5  # 超强指示符额外加分
+        )
+
+        final_project_score = (
+            project_score
+            + structure_analysis["project_info_count"] * 3  # 项目信息每项+3分
+            + structure_analysis["ultra_project_score"] * 0.5  # 超强指示符额外加分
+        )
+
+        # 发件人权重调整
+        if sender_analysis["domain_type"] == "recruiting":
+            final_engineer_score += 5.0
+
+        logger.info(
+            f"最终评分 - 工程师: {final_engineer_score:.1f}, 项目: {final_project_score:.1f}"
+        )
+        logger.info(f"工程师关键词: {engineer_keywords[:3]}")
+        logger.info(f"项目关键词: {project_keywords[:3]}")
 
-            final_project_score = (
-                project_score
-                + structure_analysis["project_info_count"] * 3  # 项目信息每项+3分
-                + structure_analysis["ultra_project_score"] * 0.5  # 超强指示符额外加分
+        # 7. 高置信度判断 - 提高判断阈值
+        if (
+            final_engineer_score > final_project_score + 5.0
+            and final_engineer_score > 10.0
+        ):
+            confidence = min(0.95, 0.7 + final_engineer_score * 0.02)
+            logger.info(
+                f"工程师分类确定: 分数差异足够大 ({final_engineer_score:.1f} vs {final_project_score:.1f})"
             )
+            return EmailType.ENGINEER_RELATED
 
-            # 发件人权重调整
-            if sender_analysis["domain_type"] == "recruiting":
-                final_engineer_score += 5.0
+        if (
+            final_project_score > final_engineer_score + 5.0
+            and final_project_score > 10.0
+        ):
+            confidence = min(0.95, 0.7 + final_project_score * 0.02)
+            logger.info(
+                f"项目分类确定: 分数差异足够大 ({final_project_score:.1f} vs {final_engineer_score:.1f})"
+            )
+            return EmailType.PROJECT_RELATED
 
+        # 8. 任一综合评分已超过绝对阈值时，AI 几乎不会改变结论，直接返回以节省调用
+        if (
+            max(final_engineer_score, final_project_score)
+            > self.ai_skip_score_threshold
+            and final_engineer_score != final_project_score
+        ):
+            result = (
+                EmailType.ENGINEER_RELATED
+                if final_engineer_score > final_project_score
+                else EmailType.PROJECT_RELATED
+            )
             logger.info(
-                f"最终评分 - 工程师: {final_engineer_score:.1f}, 项目: {final_project_score:.1f}"
+                f"评分超过阈值 {self.ai_skip_score_threshold:.1f}，跳过AI分类: {result.value} "
+                f"({final_engineer_score:.1f} vs {final_project_score:.1f})"
             )
-            logger.info(f"工程师关键词: {engineer_keywords[:3]}")
-            logger.info(f"项目关键词: {project_keywords[:3]}")
+            return result
 
-            # 7. 高置信度判断 - 提高判断阈值
-            if (
-                final_engineer_score > final_project_score + 5.0
-                and final_engineer_score > 10.0
-            ):
-                confidence = min(0.95, 0.7 + final_engineer_score * 0.02)
-                logger.info(
-                    f"工程师分类确定: 分数差异足够大 ({final_engineer_score:.1f} vs {final_project_score:.1f})"
-                )
-                return EmailType.ENGINEER_RELATED
+        # 9. AI分析（当规则无法确定时）
+        if self.ai_client:
+            logger.info("调用AI进行分类")
+            ai_result = await self._call_ai_classifier(
+                email_data, extracted_content, sender_analysis, structure_analysis
+            )
+            return ai_result
+
+        # 10. 基础规则分类
+        return self._fallback_classification(
+            extracted_lower,
+            final_project_score,
+            final_engineer_score,
+            project_keywords,
+            engineer_keywords,
+        )
 
-            if (
-                final_project_score > final_engineer_score + 5.0
-                and final_project_score > 10.0
-            ):
-                confidence = min(0.95, 0.7 + final_project_score * 0.02)
-                logger.info(
-                    f"项目分类确定: 分数差异足够大 ({final_project_score:.1f} vs {final_engineer_score:.1f})"
-                )
-                return EmailType.PROJECT_RELATED
 
-            # 8. AI分析（当规则无法确定时）
-            if self.ai_client:
-                logger.info("调用AI进行分类")
-                ai_result = await self._call_ai_classifier(
-                    email_data, extracted_content, sender_analysis, structure_analysis
-                )
-                return ai_result
+    async def classify_emails_batch(
+        self, emails: List[Dict], max_concurrency: int = 8
+    ) -> List[EmailType]:
+        """并发分类多封邮件（同时进行的分类数受限），结果顺序与输入一致"""
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-            # 9. 基础规则分类
-            return self._fallback_classification(
-                extracted_content,
-                final_project_score,
-                final_engineer_score,
-                project_keywords,
-                engineer_keywords,
-            )
+        async def _classify(email_data: Dict) -> EmailType:
+            async with semaphore:
+                return await self.classify_email(email_data)
 
-        except Exception as e:
-            logger.error(f"邮件分类过程出错: {e}")
-            return EmailType.UNCLASSIFIED
+        return await asyncio.gather(*(_classify(email_data) for email_data in emails))
 
     async def _call_ai_classifier(
         self,
@@ -873,7 +1010,7 @@ JSONのみで回答してください。
                         },
                     )
                     response.raise_for_status()
-                    data = response.json()
+                    data = fast_json.loads(response.content)
                     content = data["choices"][0]["message"]["content"].strip()
                 else:
                     # NoAuthCustomAPIProcessor
@@ -971,7 +1108,7 @@ JSONのみで回答してください。
         project_keywords: List[str],
         engineer_keywords: List[str],
     ) -> EmailType:
-        """备用分类逻辑 - 改进版本"""
+        """备用分类逻辑 - 改进版本（content 为已小写化的提取内容）"""
         logger.info(
             f"使用备用分类逻辑 - 项目得分: {project_score:.1f}, 工程师得分: {engineer_score:.1f}"
         )
@@ -984,7 +1121,7 @@ JSONのみで回答してください。
             logger.info(f"备用分类: project_related, 关键词: {project_keywords[:3]}")
             return EmailType.PROJECT_RELATED
         elif any(
-            word in content.lower() for word in ["説明会", "案内", "勉強会", "セミナー"]
+            word in content for word in ["説明会", "案内", "勉強会", "セミナー"]
         ):
             logger.info("备用分类: other")
             return EmailType.OTHER
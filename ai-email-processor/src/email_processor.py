@@ -3,13 +3,16 @@
 
 import asyncio
 import logging
-from typing import List
+from typing import List, Optional
 
 from src.config import Config
 from src.database.database_manager import db_manager
 from src.database.email_repository import email_repository
-from src.services.email_processing_service import email_processing_service
+from src.services.email_processing_service import (
+    get_shared_email_processing_service,
+)
 from src.ai_services.ai_client_manager import ai_client_manager
+from src.email.email_fetcher import email_fetcher
 from src.models.data_models import EmailProcessingResult
 
 # 设置日志
@@ -27,15 +30,16 @@ class EmailProcessor:
             db_config: 数据库配置，如果为None则使用默认配置
         """
         self.db_config = db_config or Config.get_db_config()
-        self.email_processing_service = email_processing_service
+        self.email_processing_service = get_shared_email_processing_service()
         self.email_repo = email_repository
+        self.tenant_concurrency = Config.EMAIL_PROCESSING["tenant_concurrency"]
 
         logger.info("EmailProcessor initialized with modular architecture")
 
     async def initialize(self):
         """初始化处理器和所有依赖服务"""
         try:
-            # 初始化数据库连接
+            # 初始化数据库连接（复用进程级共享连接池）
             db_manager.db_config = self.db_config
             await db_manager.initialize()
 
@@ -51,6 +55,9 @@ class EmailProcessor:
             # 关闭AI客户端
             await ai_client_manager.close_all_clients()
 
+            # 关闭缓存的IMAP连接
+            await email_fetcher.close_all()
+
             # 关闭数据库连接
             await db_manager.close()
 
@@ -59,34 +66,34 @@ class EmailProcessor:
         except Exception as e:
             logger.error(f"Error during EmailProcessor cleanup: {e}")
 
-    async def process_all_tenants(self) -> List[EmailProcessingResult]:
-        """处理所有活跃租户的邮件"""
+    async def process_all_tenants(
+        self, tenant_ids: Optional[List[str]] = None
+    ) -> List[EmailProcessingResult]:
+        """处理多个租户的邮件（租户间并发，受 tenant_concurrency 限制）
+
+        Args:
+            tenant_ids: 要处理的租户ID，为None时处理所有活跃租户
+        """
         all_results = []
 
         try:
-            # 获取所有活跃租户
-            tenant_ids = await self.email_repo.get_active_tenant_ids()
-            logger.info(f"Found {len(tenant_ids)} active tenants")
-
-            for tenant_id in tenant_ids:
-                try:
-                    logger.info(f"Processing emails for tenant: {tenant_id}")
-
-                    # 处理租户邮件
-                    tenant_results = (
-                        await self.email_processing_service.process_emails_for_tenant(
-                            tenant_id
-                        )
-                    )
-                    all_results.extend(tenant_results)
-
-                    logger.info(
-                        f"Processed {len(tenant_results)} emails for tenant {tenant_id}"
+            if tenant_ids is None:
+                # 获取所有活跃租户
+                tenant_ids = await self.email_repo.get_active_tenant_ids()
+                logger.info(f"Found {len(tenant_ids)} active tenants")
+
+            # TaskGroup 保证退出时所有租户任务均已结束（被取消时一并取消）
+            semaphore = asyncio.Semaphore(self.tenant_concurrency)
+            async with asyncio.TaskGroup() as task_group:
+                tasks = [
+                    task_group.create_task(
+                        self._process_tenant_bounded(tenant_id, semaphore)
                     )
+                    for tenant_id in tenant_ids
+                ]
 
-                except Exception as e:
-                    logger.error(f"Error processing emails for tenant {tenant_id}: {e}")
-                    continue
+            for task in tasks:
+                all_results.extend(task.result())
 
             logger.info(f"Total processed emails: {len(all_results)}")
             return all_results
@@ -95,6 +102,30 @@ class EmailProcessor:
             logger.error(f"Error in process_all_tenants: {e}")
             raise
 
+    async def _process_tenant_bounded(
+        self, tenant_id: str, semaphore: asyncio.Semaphore
+    ) -> List[EmailProcessingResult]:
+        """在信号量限制下处理单个租户，异常只记录日志，不影响其他租户"""
+        async with semaphore:
+            try:
+                logger.info(f"Processing emails for tenant: {tenant_id}")
+
+                # 处理租户邮件
+                tenant_results = (
+                    await self.email_processing_service.process_emails_for_tenant(
+                        tenant_id
+                    )
+                )
+
+                logger.info(
+                    f"Processed {len(tenant_results)} emails for tenant {tenant_id}"
+                )
+                return tenant_results
+
+            except Exception as e:
+                logger.error(f"Error processing emails for tenant {tenant_id}: {e}")
+                return []
+
     async def process_tenant(self, tenant_id: str) -> List[EmailProcessingResult]:
         """处理指定租户的邮件"""
         try:
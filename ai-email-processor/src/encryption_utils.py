@@ -5,10 +5,20 @@
 # and a separate migration script will be needed to encrypt existing passwords.
 
 import base64
+import functools
 import hashlib
+import logging
+import os
+from typing import List, Optional
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from src.config import Config
 
+logger = logging.getLogger(__name__)
+
 class EncryptionError(Exception):
     """Custom exception for encryption errors."""
     pass
@@ -17,88 +27,93 @@ class DecryptionError(Exception):
     """Custom exception for decryption errors."""
     pass
 
+# Version prefix for AES-GCM tokens: b'\x02' + 12-byte nonce + ciphertext/tag.
+# Legacy Fernet tokens start with base64 text (b'gAAAAA...'), so they never
+# collide with this prefix and are still decrypted through Fernet.
+# Migration note: tokens written by encrypt() are binary AES-GCM tokens that
+# Fernet-only readers of smtp_password_encrypted cannot decrypt; upgrade every
+# reader of that column before writing new passwords with this module.
+AESGCM_VERSION = b"\x02"
+AESGCM_NONCE_SIZE = 12
+# HKDF info label, so the AES-GCM key is independent of the Fernet key
+AESGCM_KEY_INFO = b"aes-gcm"
+
 def _derive_key(key: str) -> bytes:
     """Derives a Fernet-compatible key from the input string key."""
     return base64.urlsafe_b64encode(hashlib.sha256(key.encode()).digest())
 
+@functools.lru_cache(maxsize=32)
+def _get_fernet(key: str) -> Fernet:
+    """Returns a cached Fernet instance so key derivation runs once per key.
+
+    Call _get_fernet.cache_clear() after rotating keys.
+    """
+    return Fernet(_derive_key(key))
+
+@functools.lru_cache(maxsize=32)
+def _get_aesgcm(key: str) -> AESGCM:
+    """Returns a cached AES-256-GCM instance with an HKDF-derived key.
+
+    Call _get_aesgcm.cache_clear() after rotating keys.
+    """
+    aes_key = HKDF(
+        algorithm=hashes.SHA256(), length=32, salt=None, info=AESGCM_KEY_INFO
+    ).derive(key.encode())
+    return AESGCM(aes_key)
+
+def _encrypt_token(text: str, key: str) -> bytes:
+    """Encrypts text into a versioned AES-GCM token."""
+    nonce = os.urandom(AESGCM_NONCE_SIZE)
+    ciphertext = _get_aesgcm(key).encrypt(nonce, text.encode(), None)
+    return AESGCM_VERSION + nonce + ciphertext
+
+def _decrypt_token(encrypted_text: bytes, key: str) -> str:
+    """Decrypts an AES-GCM token, falling back to Fernet for legacy tokens."""
+    if isinstance(encrypted_text, bytes) and encrypted_text[:1] == AESGCM_VERSION:
+        nonce_end = 1 + AESGCM_NONCE_SIZE
+        nonce, ciphertext = encrypted_text[1:nonce_end], encrypted_text[nonce_end:]
+        return _get_aesgcm(key).decrypt(nonce, ciphertext, None).decode()
+    return _get_fernet(key).decrypt(encrypted_text).decode()
+
 def encrypt(text: str, key: str) -> bytes:
-    """Encrypts text using Fernet symmetric encryption."""
+    """Encrypts text using AES-GCM symmetric encryption."""
     try:
-        fernet_key = _derive_key(key)
-        f = Fernet(fernet_key)
-        encrypted_text = f.encrypt(text.encode())
+        encrypted_text = _encrypt_token(text, key)
         return encrypted_text
     except Exception as e:
-        # Log error or handle appropriately
-        print(f"Encryption failed: {e}")
+        logger.debug("Encryption failed: %s", e)
         raise EncryptionError(f"Encryption failed: {e}") from e
 
 def decrypt(encrypted_text: bytes, key: str) -> str | None:
-    """Decrypts text using Fernet symmetric encryption."""
+    """Decrypts AES-GCM tokens (and legacy Fernet tokens)."""
     try:
-        fernet_key = _derive_key(key)
-        f = Fernet(fernet_key)
-        decrypted_text = f.decrypt(encrypted_text)
-        return decrypted_text.decode()
-    except InvalidToken:
-        print("Decryption failed: Invalid token or incorrect key.")
+        return _decrypt_token(encrypted_text, key)
+    except (InvalidToken, InvalidTag):
+        logger.debug("Decryption failed: Invalid token or incorrect key.")
         # It's important to not reveal too much about why decryption failed for security.
         # For example, don't differentiate between "wrong key" and "corrupted data".
         raise DecryptionError("Decryption failed: Invalid token or incorrect key.")
     except Exception as e:
-        print(f"Decryption failed: {e}")
+        logger.debug("Decryption failed: %s", e)
         raise DecryptionError(f"Decryption failed: {e}") from e
 
-if __name__ == '__main__':
-    # Example Usage (optional - for testing)
-    # Ensure ENCRYPTION_KEY is set in your .env file or environment for this test to work
-    # from dotenv import load_dotenv
-    # import os
-    # load_dotenv() # Load environment variables from .env file
-    # test_key = os.getenv("ENCRYPTION_KEY")
-
-    # For testing without relying on .env, you can use a placeholder key,
-    # but remember that Config.ENCRYPTION_KEY will be used in the actual application.
-    test_key = "your-super-secret-and-long-enough-passphrase-for-testing"
-    
-    if not test_key:
-        print("Please set the ENCRYPTION_KEY environment variable for testing.")
-    else:
-        original_text = "This is a secret message!"
-        print(f"Original: {original_text}")
+def decrypt_batch(encrypted_texts: List[Optional[bytes]], key: str) -> List[Optional[str]]:
+    """Decrypts several tokens with cached cipher instances.
 
+    Returns None for empty tokens and for tokens that fail to decrypt,
+    so one bad credential does not abort the whole batch.
+    """
+    results = []
+    for encrypted_text in encrypted_texts:
+        if not encrypted_text:
+            results.append(None)
+            continue
         try:
-            encrypted = encrypt(original_text, test_key)
-            print(f"Encrypted: {encrypted}")
-
-            decrypted = decrypt(encrypted, test_key)
-            print(f"Decrypted: {decrypted}")
-
-            if decrypted == original_text:
-                print("Encryption and decryption test successful!")
-            else:
-                print("Decryption did not match original text.")
+            results.append(_decrypt_token(encrypted_text, key))
+        except (InvalidToken, InvalidTag, ValueError, TypeError):
+            results.append(None)
+    return results
 
-        except EncryptionError as e:
-            print(f"Test Encryption Error: {e}")
-        except DecryptionError as e:
-            print(f"Test Decryption Error: {e}")
-
-        # Test with a wrong key
-        wrong_key = "this-is-a-wrong-key-for-sure123"
-        print("\nTesting decryption with a wrong key...")
-        try:
-            if encrypted:
-                decrypted_with_wrong_key = decrypt(encrypted, wrong_key)
-                print(f"Decrypted with wrong key: {decrypted_with_wrong_key}") # Should be None or raise error
-        except DecryptionError as e:
-            print(f"Caught expected error with wrong key: {e}")
-        
-        # Test with invalid encrypted text
-        print("\nTesting decryption with invalid encrypted text...")
-        invalid_encrypted_text = b"invalid_encrypted_text"
-        try:
-            decrypted_invalid_text = decrypt(invalid_encrypted_text, test_key)
-            print(f"Decrypted invalid text: {decrypted_invalid_text}") # Should be None or raise error
-        except DecryptionError as e:
-            print(f"Caught expected error with invalid text: {e}")
+def decrypt_batch_default(encrypted_texts: List[Optional[bytes]]) -> List[Optional[str]]:
+    """Decrypts several tokens with the application key (Config.ENCRYPTION_KEY)."""
+    return decrypt_batch(encrypted_texts, Config.ENCRYPTION_KEY)
@@ -0,0 +1,31 @@
+# src/fast_json.py
+"""JSON 序列化工具 - 优先使用 orjson，未安装时回退到标准库 json"""
+
+import json
+import logging
+from typing import Any, Union
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logging.info("orjson not installed. Falling back to standard json module.")
+
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，两种实现都可用同一异常捕获
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps(obj: Any) -> str:
+    """序列化为 JSON 字符串（紧凑格式，非 ASCII 字符不转义）"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """解析 JSON 字符串或字节串"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,28 @@
+# src/http_client.py
+"""AI API 用 httpx 客户端工厂 - 统一连接池与超时设置"""
+
+from typing import Optional
+
+import httpx
+
+# 连接池上限：并发处理邮件时复用 keep-alive 连接，减少 TLS 握手
+API_CLIENT_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+
+# 建立连接的超时（读写超时沿用各提供商配置的 timeout）
+API_CONNECT_TIMEOUT = 5.0
+
+
+def create_api_client(
+    api_base_url: str, api_key: Optional[str], timeout: float
+) -> httpx.AsyncClient:
+    """创建 API 客户端（api_key 为空时不设置 Bearer 认证头）"""
+    headers = {"Content-Type": "application/json"}
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+
+    return httpx.AsyncClient(
+        base_url=api_base_url,
+        headers=headers,
+        limits=API_CLIENT_LIMITS,
+        timeout=httpx.Timeout(timeout, connect=API_CONNECT_TIMEOUT),
+    )
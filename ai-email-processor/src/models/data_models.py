@@ -1,10 +1,11 @@
 # src/models/data_models.py
 """数据模型定义 - Pydantic模型"""
 
+from dataclasses import dataclass, field
 from datetime import datetime, date
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 from enum import Enum
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, model_validator
 import re
 import logging
 
@@ -25,6 +26,203 @@ class EmailType(str, Enum):
     UNCLASSIFIED = "unclassified"
 
 
+# 布尔字段中视为 True 的字符串（小写）
+TRUTHY_VALUES = frozenset(
+    ("true", "yes", "y", "t", "on", "1", "可能", "可", "ok", "対応可能", "はい")
+)
+
+_PROJECT_LIST_FIELDS = ("skills", "processes")
+_PROJECT_BOOL_FIELDS = ("foreigner_accepted", "freelancer_accepted")
+# start_date / application_deadline 为 date 类型，交由 pydantic 解析
+_PROJECT_OPTIONAL_STR_FIELDS = (
+    "client_company",
+    "partner_company",
+    "description",
+    "detail_description",
+    "key_technologies",
+    "location",
+    "work_type",
+    "duration",
+    "budget",
+    "desired_budget",
+    "japanese_level",
+    "experience",
+    "manager_name",
+    "manager_email",
+)
+
+_ENGINEER_LIST_FIELDS = (
+    "preferred_work_style",
+    "preferred_locations",
+    "certifications",
+    "skills",
+    "technical_keywords",
+)
+_ENGINEER_BOOL_FIELDS = ("overtime_available", "business_trip_available")
+
+_DIGIT_RE = re.compile(r"\d+")
+_LEVEL_DIGIT_RE = re.compile(r"[1-5]")
+
+# 语言水平映射规则（按顺序做子串匹配，先命中者优先）
+_LANGUAGE_LEVEL_MAPPINGS = (
+    ("n1", "ネイティブレベル"),
+    ("n2", "ビジネスレベル"),
+    ("n3", "日常会話レベル"),
+    ("n4", "日常会話レベル"),
+    ("n5", "日常会話レベル"),
+    ("1級", "ネイティブレベル"),
+    ("2級", "ビジネスレベル"),
+    ("3級", "日常会話レベル"),
+    ("4級", "日常会話レベル"),
+    ("5級", "日常会話レベル"),
+    ("ネイティブ", "ネイティブレベル"),
+    ("native", "ネイティブレベル"),
+    ("ほぼ流暢", "ビジネスレベル"),
+    ("流暢", "ビジネスレベル"),
+    ("fluent", "ビジネスレベル"),
+    ("ビジネス", "ビジネスレベル"),
+    ("business", "ビジネスレベル"),
+    ("日常会話", "日常会話レベル"),
+    ("conversational", "日常会話レベル"),
+    ("基本", "日常会話レベル"),
+    ("basic", "日常会話レベル"),
+    ("初級", "日常会話レベル"),
+    ("中級", "日常会話レベル"),
+    ("上級", "ビジネスレベル"),
+    ("advanced", "ビジネスレベル"),
+    ("不問", "不問"),
+    ("問わない", "不問"),
+    ("なし", "不問"),
+    ("none", "不問"),
+)
+
+# 直接映射和数字等级都未命中时的默认映射策略
+_LANGUAGE_LEVEL_FALLBACKS = (
+    (("上級", "高級", "1級", "n1", "ネイティブ", "native"), "ネイティブレベル"),
+    (("ビジネス", "business", "2級", "n2", "流暢", "fluent"), "ビジネスレベル"),
+    (("会話", "conversational", "3級", "4級", "n3", "n4"), "日常会話レベル"),
+    (("不問", "問わない", "なし", "none"), "不問"),
+)
+
+# 工程师状态
+_ALLOWED_STATUSES = frozenset(
+    ("提案中", "事前面談", "面談", "結果待ち", "契約中", "営業終了", "アーカイブ")
+)
+
+# 状态映射（按顺序做子串匹配）
+_STATUS_MAPPINGS = (
+    ("新規", "提案中"),
+    ("提案", "提案中"),
+    ("面接", "面談"),
+    ("面接中", "面談"),
+    ("結果", "結果待ち"),
+    ("契約", "契約中"),
+    ("終了", "営業終了"),
+    ("完了", "営業終了"),
+)
+
+
+def _to_str_list(v) -> List[str]:
+    """列表字段规范化：逗号分隔字符串拆分为列表，去除 None"""
+    if isinstance(v, list):
+        # LLM 返回的通常已是字符串列表，直接复用
+        if all(type(item) is str for item in v):
+            return v
+        return [str(item) for item in v if item is not None]
+    if isinstance(v, str):
+        return [item.strip() for item in v.split(",") if item.strip()]
+    return []
+
+
+def _to_bool(v) -> bool:
+    """布尔字段规范化"""
+    if v is None or v is False:
+        return False
+    if v is True:
+        return True
+    # LLM 常以 1/0 表示布尔值（此前由 pydantic 的宽松转换处理）
+    if isinstance(v, (int, float)):
+        return bool(v)
+    return isinstance(v, str) and v.lower() in TRUTHY_VALUES
+
+
+def _to_int(v, default: int) -> int:
+    """整数字段规范化，无法转换时返回默认值"""
+    if isinstance(v, int):
+        return v
+    if isinstance(v, str):
+        try:
+            return int(v)
+        except ValueError:
+            return default
+    return default
+
+
+def _parse_rate(v: str) -> Optional[int]:
+    """从单价文本中提取第一个数字"""
+    match = _DIGIT_RE.search(v)
+    return int(match.group()) if match else None
+
+
+def _normalize_gender(v) -> str:
+    """性别规范化"""
+    v_str = str(v).lower()
+
+    if any(word in v_str for word in ["男", "male", "m"]):
+        return "男性"
+    elif any(word in v_str for word in ["女", "female", "f"]):
+        return "女性"
+    else:
+        return "回答しない"
+
+
+def _normalize_language_level(v) -> str:
+    """语言水平规范化"""
+    v_str = str(v).lower()
+
+    # 尝试直接映射
+    for key, mapped_value in _LANGUAGE_LEVEL_MAPPINGS:
+        if key in v_str:
+            logger.info(f"语言水平映射: '{v}' -> '{mapped_value}'")
+            return mapped_value
+
+    # 如果包含数字，尝试提取等级
+    match = _LEVEL_DIGIT_RE.search(v_str)
+    if match:
+        level = int(match.group())
+        if level == 1:
+            return "ネイティブレベル"
+        elif level == 2:
+            return "ビジネスレベル"
+        else:
+            return "日常会話レベル"
+
+    # 默认映射策略
+    for words, mapped_value in _LANGUAGE_LEVEL_FALLBACKS:
+        for word in words:
+            if word in v_str:
+                return mapped_value
+
+    logger.warning(f"无法识别的语言水平: '{v}'，默认设为日常会話レベル")
+    return "日常会話レベル"
+
+
+def _normalize_current_status(v) -> str:
+    """状态规范化"""
+    if v is None:
+        return "提案中"
+
+    v_str = str(v)
+    if v_str in _ALLOWED_STATUSES:
+        return v_str
+
+    for key, mapped_status in _STATUS_MAPPINGS:
+        if key in v_str:
+            return mapped_status
+
+    return "提案中"
+
+
 class SMTPSettings(BaseModel):
     """SMTP设置数据模型"""
 
@@ -52,9 +250,9 @@ class ProjectStructured(BaseModel):
     key_technologies: Optional[str] = None
     location: Optional[str] = None
     work_type: Optional[str] = None
-    start_date: Optional[str] = None
+    start_date: Optional[date] = None
     duration: Optional[str] = None
-    application_deadline: Optional[str] = None
+    application_deadline: Optional[date] = None
     budget: Optional[str] = None
     desired_budget: Optional[str] = None
     japanese_level: Optional[str] = None
@@ -67,103 +265,31 @@ class ProjectStructured(BaseModel):
     manager_name: Optional[str] = None
     manager_email: Optional[str] = None
 
-    @field_validator("title")
+    @model_validator(mode="before")
     @classmethod
-    def validate_title(cls, v):
-        """标题验证器"""
-        if not v or v is None:
-            return "案件名不明"
-        return str(v)
-
-    @field_validator("interview_count")
-    @classmethod
-    def validate_interview_count(cls, v):
-        """面试回数验证器"""
-        if v is None:
-            return "1"
-        if isinstance(v, int):
-            return str(v)
-        if isinstance(v, str):
-            return v
-        return str(v)
-
-    @field_validator("processes")
-    @classmethod
-    def validate_processes(cls, v):
-        """工程列表验证器"""
-        if v is None:
-            return []
-        if isinstance(v, list):
-            return [str(item) for item in v if item is not None]
-        if isinstance(v, str):
-            return [item.strip() for item in v.split(",") if item.strip()]
-        return []
-
-    @field_validator("skills")
-    @classmethod
-    def validate_skills(cls, v):
-        """技能列表验证器"""
-        if v is None:
-            return []
-        if isinstance(v, list):
-            return [str(item) for item in v if item is not None]
-        if isinstance(v, str):
-            return [item.strip() for item in v.split(",") if item.strip()]
-        return []
-
-    @field_validator("max_candidates")
-    @classmethod
-    def validate_max_candidates(cls, v):
-        """最大候选人数验证器"""
-        if v is None:
-            return 5
-        if isinstance(v, int):
-            return v
-        if isinstance(v, str):
-            try:
-                return int(v)
-            except ValueError:
-                return 5
-        return 5
-
-    @field_validator("foreigner_accepted", "freelancer_accepted")
-    @classmethod
-    def validate_boolean_fields(cls, v):
-        """布尔字段验证器"""
-        if v is None:
-            return False
-        if isinstance(v, bool):
-            return v
-        if isinstance(v, str):
-            return v.lower() in ("true", "yes", "可能", "可", "ok", "対応可能", "はい")
-        return False
-
-    @field_validator(
-        "client_company",
-        "partner_company",
-        "description",
-        "detail_description",
-        "key_technologies",
-        "location",
-        "work_type",
-        "start_date",
-        "duration",
-        "application_deadline",
-        "budget",
-        "desired_budget",
-        "japanese_level",
-        "experience",
-        "manager_name",
-        "manager_email",
-    )
-    @classmethod
-    def validate_optional_string_fields(cls, v):
-        """可选字符串字段验证器"""
-        if v is None:
-            return None
-        if isinstance(v, (int, float)):
-            return str(v)
-        return str(v)
+    def normalize_fields(cls, data):
+        """在一次字典遍历中完成字段规范化，其余类型校验交给 pydantic-core"""
+        if not isinstance(data, dict):
+            return data
+
+        data = dict(data)
+        if "title" in data:
+            data["title"] = str(data["title"]) if data["title"] else "案件名不明"
+        if "interview_count" in data:
+            value = data["interview_count"]
+            data["interview_count"] = "1" if value is None else str(value)
+        if "max_candidates" in data:
+            data["max_candidates"] = _to_int(data["max_candidates"], 5)
+        for name in _PROJECT_LIST_FIELDS:
+            if name in data:
+                data[name] = _to_str_list(data[name])
+        for name in _PROJECT_BOOL_FIELDS:
+            if name in data:
+                data[name] = _to_bool(data[name])
+        for name in _PROJECT_OPTIONAL_STR_FIELDS:
+            if data.get(name) is not None:
+                data[name] = str(data[name])
+        return data
 
 
 class EngineerStructured(BaseModel):
@@ -199,222 +325,40 @@ class EngineerStructured(BaseModel):
     recommendation: Optional[str] = None
     source_filename: Optional[str] = None
 
-    @field_validator("name")
+    @model_validator(mode="before")
     @classmethod
-    def validate_name(cls, v):
-        """姓名验证器"""
-        if not v or v is None:
-            return "名前不明"
-        return str(v)
-
-    @field_validator("experience")
-    @classmethod
-    def validate_experience(cls, v):
-        """经验验证器"""
-        if not v or v is None:
-            return "不明"
-        return str(v)
-
-    @field_validator("age")
-    @classmethod
-    def validate_age(cls, v):
-        """年龄字段验证器"""
-        if v is None:
-            return None
-        if isinstance(v, int):
-            return str(v)
-        if isinstance(v, str):
-            return v
-        return str(v)
-
-    @field_validator("phone")
-    @classmethod
-    def validate_phone(cls, v):
-        """电话号码验证器"""
-        if v is None:
-            return None
-        return str(v)
-
-    @field_validator("gender")
-    @classmethod
-    def validate_gender(cls, v):
-        """性别验证器"""
-        if v is None:
-            return None
-
-        v_str = str(v).lower()
-
-        if any(word in v_str for word in ["男", "male", "m"]):
-            return "男性"
-        elif any(word in v_str for word in ["女", "female", "f"]):
-            return "女性"
-        else:
-            return "回答しない"
-
-    @field_validator("japanese_level", "english_level")
-    @classmethod
-    def validate_language_level(cls, v):
-        """语言水平验证器"""
-        if v is None:
-            return None
-
-        v_str = str(v).lower()
-
-        # 语言水平映射规则
-        mappings = {
-            "n1": "ネイティブレベル",
-            "n2": "ビジネスレベル",
-            "n3": "日常会話レベル",
-            "n4": "日常会話レベル",
-            "n5": "日常会話レベル",
-            "1級": "ネイティブレベル",
-            "2級": "ビジネスレベル",
-            "3級": "日常会話レベル",
-            "4級": "日常会話レベル",
-            "5級": "日常会話レベル",
-            "ネイティブ": "ネイティブレベル",
-            "native": "ネイティブレベル",
-            "ほぼ流暢": "ビジネスレベル",
-            "流暢": "ビジネスレベル",
-            "fluent": "ビジネスレベル",
-            "ビジネス": "ビジネスレベル",
-            "business": "ビジネスレベル",
-            "日常会話": "日常会話レベル",
-            "conversational": "日常会話レベル",
-            "基本": "日常会話レベル",
-            "basic": "日常会話レベル",
-            "初級": "日常会話レベル",
-            "中級": "日常会話レベル",
-            "上級": "ビジネスレベル",
-            "advanced": "ビジネスレベル",
-            "不問": "不問",
-            "問わない": "不問",
-            "なし": "不問",
-            "none": "不問",
-        }
-
-        # 尝试直接映射
-        for key, mapped_value in mappings.items():
-            if key in v_str:
-                logger.info(f"语言水平映射: '{v}' -> '{mapped_value}'")
-                return mapped_value
-
-        # 如果包含数字，尝试提取等级
-        numbers = re.findall(r"[1-5]", v_str)
-        if numbers:
-            level = int(numbers[0])
-            if level == 1:
-                return "ネイティブレベル"
-            elif level == 2:
-                return "ビジネスレベル"
-            else:
-                return "日常会話レベル"
-
-        # 默认映射策略
-        if any(
-            word in v_str
-            for word in ["上級", "高級", "1級", "n1", "ネイティブ", "native"]
-        ):
-            return "ネイティブレベル"
-        elif any(
-            word in v_str
-            for word in ["ビジネス", "business", "2級", "n2", "流暢", "fluent"]
-        ):
-            return "ビジネスレベル"
-        elif any(
-            word in v_str
-            for word in ["会話", "conversational", "3級", "4級", "n3", "n4"]
-        ):
-            return "日常会話レベル"
-        elif any(word in v_str for word in ["不問", "問わない", "なし", "none"]):
-            return "不問"
-        else:
-            logger.warning(f"无法识别的语言水平: '{v}'，默认设为日常会話レベル")
-            return "日常会話レベル"
-
-    @field_validator("current_status")
-    @classmethod
-    def validate_current_status(cls, v):
-        """状态验证器"""
-        if v is None:
-            return "提案中"
-
-        allowed_statuses = [
-            "提案中",
-            "事前面談",
-            "面談",
-            "結果待ち",
-            "契約中",
-            "営業終了",
-            "アーカイブ",
-        ]
-
-        v_str = str(v)
-        if v_str in allowed_statuses:
-            return v_str
-
-        # 状态映射
-        status_mappings = {
-            "新規": "提案中",
-            "提案": "提案中",
-            "面接": "面談",
-            "面接中": "面談",
-            "結果": "結果待ち",
-            "契約": "契約中",
-            "終了": "営業終了",
-            "完了": "営業終了",
-        }
-
-        for key, mapped_status in status_mappings.items():
-            if key in v_str:
-                return mapped_status
-
-        return "提案中"
-
-    @field_validator(
-        "preferred_work_style",
-        "preferred_locations",
-        "certifications",
-        "skills",
-        "technical_keywords",
-    )
-    @classmethod
-    def validate_list_fields(cls, v):
-        """列表字段验证器"""
-        if v is None:
-            return []
-        if isinstance(v, list):
-            return v
-        if isinstance(v, str):
-            return [item.strip() for item in v.split(",") if item.strip()]
-        return []
-
-    @field_validator("desired_rate_min", "desired_rate_max")
-    @classmethod
-    def validate_rate(cls, v):
-        """单价验证器"""
-        if v is None:
-            return None
-        if isinstance(v, int):
-            return v
-        if isinstance(v, str):
-            numbers = re.findall(r"\d+", v)
-            if numbers:
-                return int(numbers[0])
-            return None
-        return None
-
-    @field_validator("overtime_available", "business_trip_available")
-    @classmethod
-    def validate_boolean(cls, v):
-        """布尔值验证器"""
-        if v is None:
-            return False
-        if isinstance(v, bool):
-            return v
-        if isinstance(v, str):
-            return v.lower() in ("true", "yes", "可能", "可", "ok", "対応可能", "はい")
-        return False
+    def normalize_fields(cls, data):
+        """在一次字典遍历中完成字段规范化，其余类型校验交给 pydantic-core"""
+        if not isinstance(data, dict):
+            return data
+
+        data = dict(data)
+        if "name" in data:
+            data["name"] = str(data["name"]) if data["name"] else "名前不明"
+        if "experience" in data:
+            data["experience"] = (
+                str(data["experience"]) if data["experience"] else "不明"
+            )
+        for name in ("age", "phone"):
+            if data.get(name) is not None:
+                data[name] = str(data[name])
+        if data.get("gender") is not None:
+            data["gender"] = _normalize_gender(data["gender"])
+        for name in ("japanese_level", "english_level"):
+            if data.get(name) is not None:
+                data[name] = _normalize_language_level(data[name])
+        if "current_status" in data:
+            data["current_status"] = _normalize_current_status(data["current_status"])
+        for name in _ENGINEER_LIST_FIELDS:
+            if name in data:
+                data[name] = _to_str_list(data[name])
+        for name in ("desired_rate_min", "desired_rate_max"):
+            if isinstance(data.get(name), str):
+                data[name] = _parse_rate(data[name])
+        for name in _ENGINEER_BOOL_FIELDS:
+            if name in data:
+                data[name] = _to_bool(data[name])
+        return data
 
 
 class EmailData(BaseModel):
@@ -447,13 +391,17 @@ class AttachmentInfo(BaseModel):
         arbitrary_types_allowed = True  # 允许bytes类型
 
 
-class EmailProcessingResult(BaseModel):
-    """邮件处理结果模型"""
+@dataclass(slots=True, frozen=True)
+class EmailProcessingResult:
+    """邮件处理结果（仅在进程内传递，无需校验，用 slots dataclass 减少构建开销）
+
+    ai_extracted_data 直接保存已校验的提取模型，需要字典/JSON 时再调用 model_dump
+    """
 
     email_id: str
     email_type: EmailType
     processing_status: ProcessingStatus
     project_id: Optional[str] = None
-    engineer_ids: List[str] = Field(default_factory=list)
+    engineer_ids: List[str] = field(default_factory=list)
     error_message: Optional[str] = None
-    ai_extracted_data: Optional[Dict] = None
+    ai_extracted_data: Optional[Union[ProjectStructured, EngineerStructured]] = None
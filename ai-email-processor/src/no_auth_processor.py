@@ -3,11 +3,13 @@
 # src/no_auth_processor.py
 # ====================
 
-import httpx
+import asyncio
 from typing import Dict, Optional
-import json
 import logging
 
+from src.http_client import create_api_client
+from src import fast_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,12 +19,20 @@ def extract_json(content):
         return content  # 已经是JSON对象了
 
     if isinstance(content, str):
+        # 整个响应本身就是JSON对象时直接解析，无需截取
+        stripped = content.strip()
+        if stripped.startswith("{") and stripped.endswith("}"):
+            try:
+                return fast_json.loads(stripped)
+            except fast_json.JSONDecodeError:
+                pass
+
         json_start = content.find("{")
         json_end = content.rfind("}") + 1
 
         if json_start >= 0 and json_end > json_start:
             json_str = content[json_start:json_end]
-            return json.loads(json_str)
+            return fast_json.loads(json_str)
 
     return None
 
@@ -31,7 +41,11 @@ class NoAuthCustomAPIProcessor:
     """无认证自定义API处理器"""
 
     def __init__(
-        self, api_base_url: str, default_model: str = "default", timeout: float = 120.0
+        self,
+        api_base_url: str,
+        default_model: str = "default",
+        timeout: float = 120.0,
+        max_concurrency: int = 16,
     ):
         self.base_url = api_base_url
         self.default_model = default_model
@@ -40,9 +54,22 @@ class NoAuthCustomAPIProcessor:
         self.headers = {
             "Content-Type": "application/json",
         }
+        # 处理器生命周期内复用同一个客户端（连接池与 keep-alive 连接）
+        self._client = create_api_client(api_base_url, None, timeout)
+        # 限制同时发往API的分类请求数
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def aclose(self):
+        """关闭底层 HTTP 客户端"""
+        await self._client.aclose()
 
     async def classify_email(self, email_data: Dict, model: str = None) -> str:
         """使用无认证自定义API进行邮件分类"""
+        async with self._semaphore:
+            return await self._classify_one(email_data, model)
+
+    async def _classify_one(self, email_data: Dict, model: str = None) -> str:
+        """发送单个分类请求"""
         # 使用默认模型或传入的模型
         use_model = model or self.default_model
 
@@ -61,38 +88,33 @@ class NoAuthCustomAPIProcessor:
         カテゴリー名のみを回答してください。
         """
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                request_data = {"content": email_data["body_text"]}
-
-                # 只有当模型名不为空时才添加model字段
-                if use_model and use_model.strip() and use_model != "default":
-                    request_data["model"] = use_model
-
-                response = await client.post(
-                    f"{self.base_url}/classify",
-                    headers=self.headers,
-                    json=request_data,
-                )
-
-                response.raise_for_status()
-                data = response.json()
-
-                category = data["category"]
-
-                if "project" in category:
-                    return "project_related"
-                elif "engineer" in category:
-                    return "engineer_related"
-                elif "other" in category:
-                    return "other"
-                else:
-                    return "unclassified"
-
-            except Exception as e:
-                logger.error(f"Error with No-Auth Custom API: {e}")
+        try:
+            request_data = {"content": email_data["body_text"]}
+
+            # 只有当模型名不为空时才添加model字段
+            if use_model and use_model.strip() and use_model != "default":
+                request_data["model"] = use_model
+
+            response = await self._client.post("/classify", json=request_data)
+
+            response.raise_for_status()
+            data = fast_json.loads(response.content)
+
+            category = data["category"]
+
+            if "project" in category:
+                return "project_related"
+            elif "engineer" in category:
+                return "engineer_related"
+            elif "other" in category:
+                return "other"
+            else:
                 return "unclassified"
 
+        except Exception as e:
+            logger.error(f"Error with No-Auth Custom API: {e}")
+            return "unclassified"
+
     async def extract_structured_data(
         self, email_data: Dict, data_type: str, model: str = None
     ) -> Optional[Dict]:
@@ -143,74 +165,57 @@ class NoAuthCustomAPIProcessor:
             }}
             """
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                request_data = {"content": email_data["body_text"]}
-
-                # 只有当模型名不为空时才添加model字段
-                if use_model and use_model.strip() and use_model != "default":
-                    request_data["model"] = use_model
+        try:
+            request_data = {"content": email_data["body_text"]}
 
-                response = await client.post(
-                    (
-                        f"{self.base_url}/extract_cv"
-                        if data_type == "engineer"
-                        else f"{self.base_url}/extract_case"
-                    ),
-                    headers=self.headers,
-                    json=request_data,
-                )
-                response.raise_for_status()
-                data = response.json()
+            # 只有当模型名不为空时才添加model字段
+            if use_model and use_model.strip() and use_model != "default":
+                request_data["model"] = use_model
 
-                content = data
-                logger.info(content)
+            response = await self._client.post(
+                "/extract_cv" if data_type == "engineer" else "/extract_case",
+                json=request_data,
+            )
+            response.raise_for_status()
+            data = fast_json.loads(response.content)
+            logger.debug("No-Auth Custom API extraction response: %s", data)
 
-                # 如果已经是字典对象，直接返回
-                if isinstance(content, dict):
-                    return content
+            # 接口通常直接返回JSON对象；否则从文本中提取JSON部分
+            return data if isinstance(data, dict) else extract_json(data)
 
-                # 提取JSON部分
-                return extract_json(content)
-
-            except Exception as e:
-                logger.error(f"Error extracting data with No-Auth Custom API: {e}")
+        except Exception as e:
+            logger.error(f"Error extracting data with No-Auth Custom API: {e}")
 
         return None
 
     async def test_connection(self) -> bool:
         """测试API连接"""
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                request_data = {
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": "Hello, this is a test message.",
-                        }
-                    ],
-                    "max_tokens": 10,
-                }
-
-                # 测试时如果有默认模型就使用
-                if (
-                    self.default_model
-                    and self.default_model.strip()
-                    and self.default_model != "default"
-                ):
-                    request_data["model"] = self.default_model
-
-                # 这里可以添加实际的API测试请求
-                # response = await client.post(
-                #     f"{self.base_url}/test",
-                #     headers=self.headers,
-                #     json=request_data,
-                # )
-                # response.raise_for_status()
-
-                logger.info("No-Auth Custom API connection test successful")
-                return True
-
-            except Exception as e:
-                logger.error(f"No-Auth Custom API connection test failed: {e}")
-                return False
+        try:
+            request_data = {
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": "Hello, this is a test message.",
+                    }
+                ],
+                "max_tokens": 10,
+            }
+
+            # 测试时如果有默认模型就使用
+            if (
+                self.default_model
+                and self.default_model.strip()
+                and self.default_model != "default"
+            ):
+                request_data["model"] = self.default_model
+
+            # 这里可以添加实际的API测试请求
+            # response = await self._client.post("/test", json=request_data)
+            # response.raise_for_status()
+
+            logger.info("No-Auth Custom API connection test successful")
+            return True
+
+        except Exception as e:
+            logger.error(f"No-Auth Custom API connection test failed: {e}")
+            return False
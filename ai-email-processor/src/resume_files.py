@@ -0,0 +1,32 @@
+# src/resume_files.py
+"""简历文件判定 - 只依赖标准库，供邮件解析器和附件处理器共用"""
+
+import re
+
+# 简历文件扩展名与文件名关键词
+RESUME_EXTENSIONS = (".docx", ".doc", ".pdf", ".xlsx", ".xls")
+RESUME_FILENAME_PATTERNS = [
+    r"履歴書",
+    r"職務経歴",
+    r"スキルシート",
+    r"resume",
+    r"cv",
+    r"profile",
+]
+_RESUME_FILENAME_RE = re.compile("|".join(RESUME_FILENAME_PATTERNS))
+
+
+def has_resume_extension(filename: str) -> bool:
+    """文件名（小写）是否为简历扩展名"""
+    return filename.endswith(RESUME_EXTENSIONS)
+
+
+def has_resume_keyword(filename: str) -> bool:
+    """文件名（小写）是否包含简历关键词"""
+    return _RESUME_FILENAME_RE.search(filename) is not None
+
+
+def is_resume_candidate(filename: str) -> bool:
+    """判断附件是否可能为简历文件（扩展名或文件名关键词匹配）"""
+    filename = filename.lower()
+    return has_resume_extension(filename) or has_resume_keyword(filename)
@@ -2,11 +2,13 @@
 """更新的邮件处理调度器 - 使用重构后的架构"""
 
 import asyncio
+from collections import Counter
 from datetime import datetime
 import logging
 from typing import Optional
 
 from src.email_processor import EmailProcessor
+from src.models.data_models import ProcessingStatus
 from src.config import Config
 
 logger = logging.getLogger(__name__)
@@ -39,15 +41,10 @@ class EmailScheduler:
             # 执行邮件处理
             results = await self.processor.process_all_tenants()
 
-            # 统计结果
-            from src.models.data_models import ProcessingStatus
-
-            success_count = sum(
-                1 for r in results if r.processing_status == ProcessingStatus.PROCESSED
-            )
-            error_count = sum(
-                1 for r in results if r.processing_status == ProcessingStatus.ERROR
-            )
+            # 统计结果（一次遍历）
+            status_counts = Counter(r.processing_status for r in results)
+            success_count = status_counts[ProcessingStatus.PROCESSED]
+            error_count = status_counts[ProcessingStatus.ERROR]
 
             logger.info(
                 f"Email processing job completed: {success_count} successful, {error_count} errors"
@@ -1,6 +1,9 @@
 # src/services/__init__.py
 """业务服务包"""
 
-from .email_processing_service import EmailProcessingService, email_processing_service
+from .email_processing_service import (
+    EmailProcessingService,
+    get_shared_email_processing_service,
+)
 
-__all__ = ["EmailProcessingService", "email_processing_service"]
+__all__ = ["EmailProcessingService", "get_shared_email_processing_service"]
@@ -1,14 +1,19 @@
 # src/services/email_processing_service.py
 """邮件处理服务 - 业务流程协调"""
 
+import asyncio
+import functools
 import logging
-from typing import List
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
 
 from src.models.data_models import (
     EmailData,
     EmailType,
+    EngineerStructured,
     ProcessingStatus,
     EmailProcessingResult,
+    SMTPSettings,
 )
 from src.email_classifier import EmailClassifier
 from src.ai_services.extraction_service import extraction_service
@@ -17,23 +22,29 @@ from src.database.email_repository import email_repository
 from src.database.project_repository import project_repository
 from src.database.engineer_repository import engineer_repository
 from src.email.email_fetcher import email_fetcher
+from src.cache_utils import TTLCache
 from src.config import Config
 
 logger = logging.getLogger(__name__)
 
+# 分类与正文提取只需要附件的文件名等元信息，转为字典时排除二进制内容
+EMAIL_DICT_EXCLUDE = {"attachments": {"__all__": {"content"}}}
+
+# 延迟写入的邮件状态：(email_id, processing_status, ai_extraction_status, error_message)
+StatusUpdate = Tuple[str, ProcessingStatus, str, Optional[str]]
+
+# EmailData 的必填字段（model_construct 不做校验，构建前需确认这些键存在）
+EMAIL_DATA_REQUIRED_FIELDS = tuple(
+    name for name, info in EmailData.model_fields.items() if info.is_required()
+)
+
 
 class EmailProcessingService:
     """邮件处理服务 - 协调整个邮件处理流程"""
 
     def __init__(self):
-        # 获取各服务的AI配置
-        classification_config = Config.get_ai_config_for_service("classification")
-        attachment_config = Config.get_ai_config_for_service("attachment")
-
-        # 初始化各个服务组件
-        self.classifier = EmailClassifier(classification_config)
+        # 分类器与简历处理器在首次使用时创建（见下方 cached_property）
         self.extraction_service = extraction_service
-        self.attachment_processor = AttachmentProcessor(attachment_config)
 
         # 数据库服务
         self.email_repo = email_repository
@@ -43,8 +54,35 @@ class EmailProcessingService:
         # 邮件获取服务
         self.email_fetcher = email_fetcher
 
+        # 每批获取并处理的邮件数（处理当前批次时预取下一批）
+        self.fetch_batch_size = Config.EMAIL_PROCESSING["batch_size"]
+        # 单个租户内的邮件并发处理数
+        self.max_concurrency = Config.EMAIL_PROCESSING["max_concurrency"]
+        # 简历附件处理期间是否提前启动正文提取
+        self.speculative_body_extraction = Config.EMAIL_PROCESSING[
+            "speculative_body_extraction"
+        ]
+        # 邮件字典是否重新校验（否则直接构建模型，不执行字段校验）
+        self.strict_email_validation = Config.EMAIL_PROCESSING[
+            "strict_email_validation"
+        ]
+
+        # 发件人 → 邮件类型的快捷映射（按租户缓存，过期后重建）
+        self.sender_shortcut = Config.CLASSIFICATION["sender_shortcut"]
+        self._sender_types = TTLCache(maxsize=1024, ttl=self.sender_shortcut["ttl"])
+
         logger.info("EmailProcessingService initialized with separated AI services")
 
+    @functools.cached_property
+    def classifier(self) -> EmailClassifier:
+        """邮件分类器（首次访问时按分类服务的AI配置创建）"""
+        return EmailClassifier(Config.get_ai_config_for_service("classification"))
+
+    @functools.cached_property
+    def attachment_processor(self) -> AttachmentProcessor:
+        """简历附件处理器（首次访问时按附件服务的AI配置创建）"""
+        return AttachmentProcessor(Config.get_ai_config_for_service("attachment"))
+
     async def process_emails_for_tenant(
         self, tenant_id: str
     ) -> List[EmailProcessingResult]:
@@ -60,30 +98,7 @@ class EmailProcessingService:
 
         for settings in settings_list:
             try:
-                # 获取新邮件
-                emails = await self.email_fetcher.fetch_emails(settings)
-                logger.info(f"Fetched {len(emails)} new emails for tenant {tenant_id}")
-
-                for email_data_dict in emails:
-                    try:
-                        # 转换为EmailData对象
-                        email_data = EmailData(**email_data_dict)
-
-                        # 处理单个邮件
-                        result = await self.process_single_email(tenant_id, email_data)
-                        results.append(result)
-
-                    except Exception as e:
-                        logger.error(f"Error processing individual email: {e}")
-                        # 创建错误结果
-                        error_result = EmailProcessingResult(
-                            email_id="error",
-                            email_type=EmailType.UNCLASSIFIED,
-                            processing_status=ProcessingStatus.ERROR,
-                            error_message=str(e),
-                        )
-                        results.append(error_result)
-                        continue
+                results.extend(await self._process_settings(tenant_id, settings))
 
             except Exception as e:
                 logger.error(f"Error processing emails for settings {settings.id}: {e}")
@@ -91,37 +106,326 @@ class EmailProcessingService:
 
         return results
 
+    async def _process_settings(
+        self, tenant_id: str, settings: SMTPSettings
+    ) -> List[EmailProcessingResult]:
+        """获取并处理一个邮箱的新邮件：处理当前批次的同时预取下一批"""
+        results = []
+        batches = self.email_fetcher.iter_email_batches(
+            settings, self.fetch_batch_size
+        )
+        fetch = asyncio.create_task(anext(batches, None))
+
+        try:
+            while (emails := await fetch) is not None:
+                fetch = asyncio.create_task(anext(batches, None))
+                logger.info(f"Fetched {len(emails)} new emails for tenant {tenant_id}")
+
+                results.extend(await self._process_email_batch(tenant_id, emails))
+
+        finally:
+            # 处理出错时停止预取；获取任务会等进行中的IMAP调用完成后才结束，再关闭生成器
+            fetch.cancel()
+            await asyncio.gather(fetch, return_exceptions=True)
+            await batches.aclose()
+
+        return results
+
+    async def _process_email_batch(
+        self, tenant_id: str, emails: List[Dict]
+    ) -> List[EmailProcessingResult]:
+        """批量处理一次获取的邮件：并发分类 → 批量保存 → 批量标记/并发提取，结果顺序与输入一致"""
+        # 信号量限制同时进行的AI调用和数据库连接数
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        # 本批次创建的项目/工程师记录共用同一时间戳
+        created_at = datetime.now()
+
+        # 1. 转换为EmailData后批量并发分类
+        results: List[
+            Union[EmailProcessingResult, Tuple[EmailData, EmailType], None]
+        ] = []
+        parsed: List[Tuple[int, EmailData]] = []
+        for email_data_dict in emails:
+            try:
+                parsed.append((len(results), self._build_email_data(email_data_dict)))
+                results.append(None)
+            except Exception as e:
+                logger.error(f"Error processing individual email: {e}")
+                results.append(self._error_result(e))
+
+        # 每封邮件只转换一次字典，分类和后续正文提取共用
+        email_dicts = {
+            index: email_data.model_dump(exclude=EMAIL_DICT_EXCLUDE)
+            for index, email_data in parsed
+        }
+        # 历史上类型稳定的发件人直接确定类型，其余邮件并发分类
+        sender_types = await self._get_sender_types(tenant_id)
+        email_types: Dict[int, EmailType] = {}
+        to_classify = []
+        for index, email_data in parsed:
+            sender_type = sender_types.get(email_data.sender_email.lower())
+            if sender_type:
+                email_types[index] = sender_type
+            else:
+                to_classify.append(index)
+
+        if email_types:
+            logger.info(f"{len(email_types)} emails typed by sender history")
+
+        classified = await self.classifier.classify_emails_batch(
+            [email_dicts[index] for index in to_classify], self.max_concurrency
+        )
+        email_types.update(zip(to_classify, classified))
+
+        for index, email_data in parsed:
+            email_type = email_types[index]
+            logger.info(f"Email classified as: {email_type.value}")
+            if email_type != EmailType.ENGINEER_RELATED:
+                # 只有工程师邮件需要解析简历附件，其余邮件尽早释放附件二进制内容
+                self._release_attachment_content(email_data.attachments)
+                self._release_attachment_content(emails[index].get("attachments") or [])
+            results[index] = (email_data, email_type)
+
+        pending = [
+            index
+            for index, item in enumerate(results)
+            if not isinstance(item, EmailProcessingResult)
+        ]
+
+        # 2. 批量保存邮件（整批失败时逐封重试，只让出错的邮件成为错误结果）
+        try:
+            email_ids = await self.email_repo.save_emails(
+                tenant_id, [results[index] for index in pending]
+            )
+            saved = list(zip(pending, email_ids))
+        except Exception as e:
+            logger.warning(
+                f"Error saving email batch for tenant {tenant_id}, "
+                f"retrying one by one: {e}"
+            )
+            saved = await self._save_emails_individually(tenant_id, pending, results)
+
+        # 3. OTHER/UNCLASSIFIED 邮件无需数据提取，一条 UPDATE 批量标记为已处理
+        extraction_types = (EmailType.PROJECT_RELATED, EmailType.ENGINEER_RELATED)
+        to_extract = []
+        processed_indexes = []
+        for index, email_id in saved:
+            if results[index][1] in extraction_types:
+                to_extract.append((index, email_id))
+            else:
+                processed_indexes.append((index, email_id))
+
+        if processed_indexes:
+            try:
+                await self.email_repo.mark_emails_processed(
+                    [email_id for _, email_id in processed_indexes]
+                )
+                for index, email_id in processed_indexes:
+                    results[index] = EmailProcessingResult(
+                        email_id=email_id,
+                        email_type=results[index][1],
+                        processing_status=ProcessingStatus.PROCESSED,
+                    )
+            except Exception as e:
+                logger.error(f"Error marking emails as processed: {e}")
+                for index, email_id in processed_indexes:
+                    results[index] = EmailProcessingResult(
+                        email_id=email_id,
+                        email_type=EmailType.UNCLASSIFIED,
+                        processing_status=ProcessingStatus.ERROR,
+                        error_message=str(e),
+                    )
+
+        # 4. 并发进行类型相关的数据提取（失败状态先收集，最后一次性写回）
+        status_updates: List[StatusUpdate] = []
+
+        async def _process(index: int, email_id: str):
+            email_data, email_type = results[index]
+            async with semaphore:
+                try:
+                    results[index] = await self._process_classified_email(
+                        tenant_id,
+                        email_data,
+                        email_type,
+                        email_id,
+                        created_at,
+                        email_dicts[index],
+                        status_updates,
+                    )
+                except Exception as e:
+                    logger.error(f"Error processing individual email: {e}")
+                    results[index] = self._error_result(e)
+
+        await asyncio.gather(
+            *(_process(index, email_id) for index, email_id in to_extract)
+        )
+
+        try:
+            await self.email_repo.update_email_statuses(status_updates)
+        except Exception as e:
+            logger.error(f"Error updating email statuses for tenant {tenant_id}: {e}")
+
+        return results
+
+    async def _save_emails_individually(
+        self, tenant_id: str, pending: List[int], results: List
+    ) -> List[Tuple[int, str]]:
+        """逐封保存邮件，保存失败的邮件在 results 中记为错误结果，返回成功的 (索引, 邮件ID)"""
+        saved = []
+        for index in pending:
+            email_data, email_type = results[index]
+            try:
+                email_id = await self.email_repo.save_email(
+                    tenant_id=tenant_id, email_data=email_data, email_type=email_type
+                )
+            except Exception as e:
+                logger.error(f"Error saving email {email_data.subject}: {e}")
+                results[index] = self._error_result(e)
+                continue
+            saved.append((index, email_id))
+        return saved
+
+    async def _get_sender_types(self, tenant_id: str) -> Dict[str, EmailType]:
+        """获取租户的发件人快捷映射（未启用或读取失败时为空）"""
+        if not self.sender_shortcut["enabled"]:
+            return {}
+
+        sender_types = self._sender_types.get(tenant_id)
+        if sender_types is None:
+            try:
+                sender_types = await self.email_repo.get_sender_email_types(
+                    tenant_id,
+                    self.sender_shortcut["min_emails"],
+                    self.sender_shortcut["min_ratio"],
+                )
+            except Exception as e:
+                logger.warning(f"Failed to load sender types for {tenant_id}: {e}")
+                return {}
+            self._sender_types.set(tenant_id, sender_types)
+
+        return sender_types
+
+    def _build_email_data(self, email_data_dict: Dict) -> EmailData:
+        """由邮件获取器产出的字典构建 EmailData
+
+        字典来自 EmailParser（已按 EmailData 校验后转储），默认只检查必填字段后以
+        model_construct 跳过重复校验；开启 strict_email_validation 时执行完整校验
+        """
+        if self.strict_email_validation:
+            return EmailData(**email_data_dict)
+
+        missing = [
+            name
+            for name in EMAIL_DATA_REQUIRED_FIELDS
+            if email_data_dict.get(name) is None
+        ]
+        if missing:
+            raise ValueError(f"Email data missing required fields: {missing}")
+        return EmailData.model_construct(**email_data_dict)
+
+    @staticmethod
+    def _release_attachment_content(attachments: List[Dict]):
+        """丢弃附件的二进制内容，只保留文件名、大小等元信息"""
+        for attachment in attachments:
+            attachment.pop("content", None)
+
+    @staticmethod
+    def _error_result(error: Exception) -> EmailProcessingResult:
+        """创建未保存邮件的错误结果"""
+        return EmailProcessingResult(
+            email_id="error",
+            email_type=EmailType.UNCLASSIFIED,
+            processing_status=ProcessingStatus.ERROR,
+            error_message=str(error),
+        )
+
+    async def _set_email_status(
+        self,
+        status_updates: Optional[List[StatusUpdate]],
+        email_id: str,
+        processing_status: ProcessingStatus,
+        ai_extraction_status: str = "completed",
+        error_message: Optional[str] = None,
+    ):
+        """更新邮件状态；传入 status_updates 时只收集，由批处理统一写回"""
+        if status_updates is None:
+            await self.email_repo.update_email_status(
+                email_id=email_id,
+                processing_status=processing_status,
+                ai_extraction_status=ai_extraction_status,
+                error_message=error_message,
+            )
+        else:
+            status_updates.append(
+                (email_id, processing_status, ai_extraction_status, error_message)
+            )
+
     async def process_single_email(
         self, tenant_id: str, email_data: EmailData
     ) -> EmailProcessingResult:
         """处理单个邮件"""
-        email_id = None
-
         try:
             # 1. 邮件分类
-            email_type = await self.classifier.classify_email(email_data.model_dump())
+            email_dict = email_data.model_dump(exclude=EMAIL_DICT_EXCLUDE)
+            email_type = await self.classifier.classify_email(email_dict)
             logger.info(f"Email classified as: {email_type.value}")
+            if email_type != EmailType.ENGINEER_RELATED:
+                self._release_attachment_content(email_data.attachments)
 
             # 2. 保存邮件到数据库
             email_id = await self.email_repo.save_email(
                 tenant_id=tenant_id, email_data=email_data, email_type=email_type
             )
 
-            # 3. 根据邮件类型进行不同处理
+        except Exception as e:
+            logger.error(f"Error processing email {email_data.subject}: {e}")
+            return self._error_result(e)
+
+        # 3. 根据邮件类型进行不同处理
+        return await self._process_classified_email(
+            tenant_id, email_data, email_type, email_id, email_dict=email_dict
+        )
+
+    async def _process_classified_email(
+        self,
+        tenant_id: str,
+        email_data: EmailData,
+        email_type: EmailType,
+        email_id: str,
+        created_at: Optional[datetime] = None,
+        email_dict: Optional[Dict] = None,
+        status_updates: Optional[List[StatusUpdate]] = None,
+    ) -> EmailProcessingResult:
+        """处理已分类并保存的邮件
+
+        email_dict 为分类时已转换的邮件字典；status_updates 不为 None 时
+        状态更新只追加到该列表，由调用方批量写回
+        """
+        try:
             if email_type == EmailType.PROJECT_RELATED:
                 return await self._process_project_email(
-                    tenant_id, email_data, email_id
+                    tenant_id,
+                    email_data,
+                    email_id,
+                    created_at,
+                    email_dict,
+                    status_updates,
                 )
 
             elif email_type == EmailType.ENGINEER_RELATED:
                 return await self._process_engineer_email(
-                    tenant_id, email_data, email_id
+                    tenant_id,
+                    email_data,
+                    email_id,
+                    created_at,
+                    email_dict,
+                    status_updates,
                 )
 
             else:
                 # OTHER或UNCLASSIFIED类型，只标记为已处理
-                await self.email_repo.update_email_status(
-                    email_id=email_id, processing_status=ProcessingStatus.PROCESSED
+                await self._set_email_status(
+                    status_updates, email_id, ProcessingStatus.PROCESSED
                 )
 
                 return EmailProcessingResult(
@@ -134,61 +438,62 @@ class EmailProcessingService:
             logger.error(f"Error processing email {email_data.subject}: {e}")
 
             # 更新邮件状态为错误
-            if email_id:
-                await self.email_repo.update_email_status(
-                    email_id=email_id,
-                    processing_status=ProcessingStatus.ERROR,
-                    error_message=str(e),
-                )
+            await self._set_email_status(
+                status_updates, email_id, ProcessingStatus.ERROR, error_message=str(e)
+            )
 
             return EmailProcessingResult(
-                email_id=email_id or "error",
+                email_id=email_id,
                 email_type=EmailType.UNCLASSIFIED,
                 processing_status=ProcessingStatus.ERROR,
                 error_message=str(e),
             )
 
     async def _process_project_email(
-        self, tenant_id: str, email_data: EmailData, email_id: str
+        self,
+        tenant_id: str,
+        email_data: EmailData,
+        email_id: str,
+        created_at: Optional[datetime] = None,
+        email_dict: Optional[Dict] = None,
+        status_updates: Optional[List[StatusUpdate]] = None,
     ) -> EmailProcessingResult:
         """处理项目相关邮件"""
         try:
-            # 提取项目信息
-            extracted_content = self.classifier.smart_content_extraction(
-                email_data.model_dump()
-            )
-            project_data = await self.extraction_service.extract_project_info(
-                email_data, extracted_content
-            )
+            # 提取项目信息（原始正文超过硬上限时不做内容提取和AI调用）
+            project_data = None
+            if not self.extraction_service.exceeds_hard_limit("project", email_data):
+                if email_dict is None:
+                    email_dict = email_data.model_dump(exclude=EMAIL_DICT_EXCLUDE)
+                extracted_content = self.classifier.smart_content_extraction(email_dict)
+                project_data = await self.extraction_service.extract_project_info(
+                    email_data, extracted_content
+                )
 
             if project_data:
-                # 保存项目信息
+                # 项目保存与邮件状态更新合并为同一条语句
                 project_id = await self.project_repo.save_project(
                     tenant_id=tenant_id,
                     project_data=project_data,
                     sender_email=email_data.sender_email,
+                    created_at=created_at,
+                    email_id=email_id,
                 )
 
                 if project_id:
-                    # 更新邮件状态
-                    await self.email_repo.update_email_status(
-                        email_id=email_id,
-                        processing_status=ProcessingStatus.PROCESSED,
-                        project_id=project_id,
-                    )
-
                     return EmailProcessingResult(
                         email_id=email_id,
                         email_type=EmailType.PROJECT_RELATED,
                         processing_status=ProcessingStatus.PROCESSED,
                         project_id=project_id,
-                        ai_extracted_data=project_data.model_dump(),
+                        ai_extracted_data=project_data,
                     )
 
             # 项目信息提取失败
-            await self.email_repo.update_email_status(
-                email_id=email_id,
-                processing_status=ProcessingStatus.ERROR,
+            await self._set_email_status(
+                status_updates,
+                email_id,
+                ProcessingStatus.ERROR,
                 ai_extraction_status="failed",
                 error_message="Failed to extract project information",
             )
@@ -205,12 +510,17 @@ class EmailProcessingService:
             raise
 
     async def _process_engineer_email(
-        self, tenant_id: str, email_data: EmailData, email_id: str
+        self,
+        tenant_id: str,
+        email_data: EmailData,
+        email_id: str,
+        created_at: Optional[datetime] = None,
+        email_dict: Optional[Dict] = None,
+        status_updates: Optional[List[StatusUpdate]] = None,
     ) -> EmailProcessingResult:
         """处理工程师相关邮件"""
+        body_task: Optional[asyncio.Task] = None
         try:
-            engineer_ids = []
-
             # 检查是否有简历附件
             attachments = email_data.attachments
             has_resume_attachments = self.attachment_processor.has_resume_attachments(
@@ -220,36 +530,35 @@ class EmailProcessingService:
             if has_resume_attachments:
                 logger.info("发现简历附件，开始处理...")
 
+                if self.speculative_body_extraction:
+                    # 正文提取与简历解析互不依赖：先行启动，简历保存成功后取消
+                    body_task = asyncio.create_task(
+                        self._extract_engineer_from_body(email_data, email_dict)
+                    )
+
                 # 处理简历附件
                 resume_data_list = (
                     await self.attachment_processor.process_resume_attachments(
                         attachments
                     )
                 )
+                # 简历已解析完毕，后续只用到附件元信息
+                self._release_attachment_content(attachments)
 
                 if resume_data_list:
                     logger.info(f"成功提取 {len(resume_data_list)} 份简历数据")
 
-                    # 保存每个简历数据
-                    for resume_data in resume_data_list:
-                        engineer_id = (
-                            await self.engineer_repo.save_engineer_from_resume(
-                                tenant_id=tenant_id,
-                                resume_data=resume_data,
-                                sender_email=email_data.sender_email,
-                            )
-                        )
-                        if engineer_id:
-                            engineer_ids.append(engineer_id)
+                    # 所有简历数据在同一事务中以预处理语句依次插入；
+                    # 第一份简历保存时同时回写邮件状态（关联第一个工程师ID）
+                    engineer_ids = await self.engineer_repo.save_engineers_from_resumes(
+                        tenant_id=tenant_id,
+                        resume_data_list=resume_data_list,
+                        sender_email=email_data.sender_email,
+                        created_at=created_at,
+                        email_id=email_id,
+                    )
 
                     if engineer_ids:
-                        # 更新邮件状态
-                        await self.email_repo.update_email_status(
-                            email_id=email_id,
-                            processing_status=ProcessingStatus.PROCESSED,
-                            engineer_id=engineer_ids[0],  # 使用第一个工程师ID
-                        )
-
                         return EmailProcessingResult(
                             email_id=email_id,
                             email_type=EmailType.ENGINEER_RELATED,
@@ -260,41 +569,37 @@ class EmailProcessingService:
                     logger.warning("简历附件处理失败，尝试从邮件正文提取")
 
             # 如果没有简历附件或处理失败，从邮件正文提取
-            extracted_content = self.classifier.smart_content_extraction(
-                email_data.model_dump()
-            )
-            engineer_data = await self.extraction_service.extract_engineer_info(
-                email_data, extracted_content
-            )
+            if body_task is not None:
+                engineer_data = await body_task
+            else:
+                engineer_data = await self._extract_engineer_from_body(
+                    email_data, email_dict
+                )
 
             if engineer_data:
-                # 保存工程师信息
+                # 工程师保存与邮件状态更新合并为同一条语句
                 engineer_id = await self.engineer_repo.save_engineer(
                     tenant_id=tenant_id,
                     engineer_data=engineer_data,
                     sender_email=email_data.sender_email,
+                    created_at=created_at,
+                    email_id=email_id,
                 )
 
                 if engineer_id:
-                    # 更新邮件状态
-                    await self.email_repo.update_email_status(
-                        email_id=email_id,
-                        processing_status=ProcessingStatus.PROCESSED,
-                        engineer_id=engineer_id,
-                    )
-
                     return EmailProcessingResult(
                         email_id=email_id,
                         email_type=EmailType.ENGINEER_RELATED,
                         processing_status=ProcessingStatus.PROCESSED,
                         engineer_ids=[engineer_id],
-                        ai_extracted_data=engineer_data.model_dump(),
+                        ai_extracted_data=engineer_data,
                     )
 
             # 工程师信息提取失败
-            await self.email_repo.update_email_status(
-                email_id=email_id,
-                processing_status=ProcessingStatus.ERROR,
+            await self._set_email_status(
+                status_updates,
+                email_id,
+                ProcessingStatus.ERROR,
                 ai_extraction_status="failed",
                 error_message="Failed to extract engineer information",
             )
@@ -310,6 +615,40 @@ class EmailProcessingService:
             logger.error(f"Error processing engineer email: {e}")
             raise
 
-
-# 全局邮件处理服务实例
-email_processing_service = EmailProcessingService()
+        finally:
+            if body_task is not None:
+                self._discard_task(body_task)
+
+    async def _extract_engineer_from_body(
+        self, email_data: EmailData, email_dict: Optional[Dict] = None
+    ) -> Optional[EngineerStructured]:
+        """从邮件正文提取工程师信息（原始正文超过硬上限时跳过）"""
+        if self.extraction_service.exceeds_hard_limit("engineer", email_data):
+            return None
+        if email_dict is None:
+            email_dict = email_data.model_dump(exclude=EMAIL_DICT_EXCLUDE)
+        extracted_content = self.classifier.smart_content_extraction(email_dict)
+        return await self.extraction_service.extract_engineer_info(
+            email_data, extracted_content
+        )
+
+    @staticmethod
+    def _discard_task(task: asyncio.Task):
+        """取消未完成的任务；已完成的任务取走异常，避免未检索异常的警告"""
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled():
+            task.exception()
+
+
+@functools.cache
+def get_shared_email_processing_service() -> EmailProcessingService:
+    """获取进程内共享的邮件处理服务实例（首次调用时创建，导入模块时不构建）"""
+    return EmailProcessingService()
+
+
+def __getattr__(name: str):
+    # 兼容旧的模块级实例导入：from ... import email_processing_service
+    if name == "email_processing_service":
+        return get_shared_email_processing_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
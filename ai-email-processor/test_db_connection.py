@@ -4,12 +4,15 @@
 import sys
 import os
 import asyncio
+import logging
 import asyncpg
 from dotenv import load_dotenv
 
 # 加载环境变量
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 async def test_db_connection():
     """测试 Supabase PostgreSQL 连接"""
@@ -23,12 +26,12 @@ async def test_db_connection():
             "password": os.getenv("DB_PASSWORD"),
         }
 
-        print("🔄 尝试连接 Supabase 数据库...")
-        print(f'📍 主机: {connection_params["host"]}')
-        print(f'📍 端口: {connection_params["port"]}')
-        print(f'📍 数据库: {connection_params["database"]}')
-        print(f'📍 用户: {connection_params["user"]}')
-        print("-" * 50)
+        logger.info("🔄 尝试连接 Supabase 数据库...")
+        logger.info("📍 主机: %s", connection_params["host"])
+        logger.info("📍 端口: %s", connection_params["port"])
+        logger.info("📍 数据库: %s", connection_params["database"])
+        logger.info("📍 用户: %s", connection_params["user"])
+        logger.info("-" * 50)
 
         # 检查必要参数
         if not all(
@@ -39,100 +42,92 @@ async def test_db_connection():
                 connection_params["password"],
             ]
         ):
-            print("❌ 缺少必要的数据库连接参数")
-            print("请检查 .env 文件中的以下设置:")
-            print("- DB_HOST")
-            print("- DB_NAME")
-            print("- DB_USER")
-            print("- DB_PASSWORD")
+            logger.error("❌ 缺少必要的数据库连接参数")
+            logger.info("请检查 .env 文件中的以下设置:")
+            logger.info("- DB_HOST")
+            logger.info("- DB_NAME")
+            logger.info("- DB_USER")
+            logger.info("- DB_PASSWORD")
             return False
 
         # 尝试连接
         conn = await asyncpg.connect(**connection_params)
-        print("✅ Supabase 数据库连接成功!")
-
-        # 测试基本查询
-        version = await conn.fetchval("SELECT version()")
-        print(f"📊 数据库版本: {version[:60]}...")
+        logger.info("✅ Supabase 数据库连接成功!")
 
-        # 检查当前数据库大小
-        db_size = await conn.fetchval(
+        # 版本、数据库大小、现有表和连接信息在一次往返中取回
+        server_info = await conn.fetchrow(
             """
-            SELECT pg_size_pretty(pg_database_size(current_database()))
-        """
-        )
-        print(f"💾 数据库大小: {db_size}")
-
-        # 列出现有表
-        tables = await conn.fetch(
-            """
-            SELECT schemaname, tablename 
-            FROM pg_tables 
-            WHERE schemaname NOT IN ('information_schema', 'pg_catalog')
-            ORDER BY schemaname, tablename
+            SELECT
+                version() as version,
+                pg_size_pretty(pg_database_size(current_database())) as db_size,
+                ARRAY(
+                    SELECT schemaname || '.' || tablename
+                    FROM pg_tables
+                    WHERE schemaname NOT IN ('information_schema', 'pg_catalog')
+                    ORDER BY schemaname, tablename
+                ) as tables,
+                current_database() as database,
+                current_user as user,
+                inet_server_addr() as server_ip,
+                inet_server_port() as server_port
         """
         )
+        logger.info("📊 数据库版本: %s...", server_info["version"][:60])
+        logger.info("💾 数据库大小: %s", server_info["db_size"])
 
+        tables = server_info["tables"]
         if tables:
-            print(f"📋 现有数据表 ({len(tables)} 个):")
+            logger.info("📋 现有数据表 (%d 个):", len(tables))
             for table in tables[:15]:  # 只显示前15个表
-                print(f'   - {table["schemaname"]}.{table["tablename"]}')
+                logger.info("   - %s", table)
             if len(tables) > 15:
-                print(f"   ... 还有 {len(tables) - 15} 个表")
+                logger.info("   ... 还有 %d 个表", len(tables) - 15)
         else:
-            print("📋 暂无用户数据表")
+            logger.info("📋 暂无用户数据表")
 
-        # 检查连接状态
-        connection_info = await conn.fetchrow(
-            """
-            SELECT 
-                current_database() as database,
-                current_user as user,
-                inet_server_addr() as server_ip,
-                inet_server_port() as server_port
-        """
-        )
-        print(f'🔗 连接信息: {connection_info["user"]}@{connection_info["database"]}')
+        logger.info("🔗 连接信息: %s@%s", server_info["user"], server_info["database"])
 
         await conn.close()
-        print("✅ 数据库连接测试完成")
+        logger.info("✅ 数据库连接测试完成")
         return True
 
     except asyncpg.InvalidPasswordError:
-        print("❌ 密码错误")
-        print("💡 请检查 Supabase 项目的数据库密码")
+        logger.error("❌ 密码错误")
+        logger.info("💡 请检查 Supabase 项目的数据库密码")
         return False
     except asyncpg.InvalidCatalogNameError:
-        print("❌ 数据库名称错误")
-        print("💡 请检查数据库名称设置")
+        logger.error("❌ 数据库名称错误")
+        logger.info("💡 请检查数据库名称设置")
         return False
     except Exception as e:
-        print(f"❌ 数据库连接失败: {e}")
-        print("💡 请检查:")
-        print("   1. 网络连接是否正常")
-        print("   2. Supabase 服务是否正常")
-        print("   3. 防火墙设置")
-        print("   4. .env 文件配置")
+        logger.error("❌ 数据库连接失败: %s", e)
+        logger.info("💡 请检查:")
+        logger.info("   1. 网络连接是否正常")
+        logger.info("   2. Supabase 服务是否正常")
+        logger.info("   3. 防火墙设置")
+        logger.info("   4. .env 文件配置")
         return False
 
 
 if __name__ == "__main__":
-    print("=" * 60)
-    print("🚀 Supabase PostgreSQL 连接测试")
-    print("=" * 60)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    logger.info("=" * 60)
+    logger.info("🚀 Supabase PostgreSQL 连接测试")
+    logger.info("=" * 60)
 
     # 检查 .env 文件是否存在
     if not os.path.exists(".env"):
-        print("❌ .env 文件不存在")
-        print("请先创建 .env 文件并配置数据库连接信息")
+        logger.error("❌ .env 文件不存在")
+        logger.info("请先创建 .env 文件并配置数据库连接信息")
         sys.exit(1)
 
     # 运行测试
     result = asyncio.run(test_db_connection())
 
-    print("=" * 60)
+    logger.info("=" * 60)
     if result:
-        print("🎉 测试成功! 数据库连接正常")
+        logger.info("🎉 测试成功! 数据库连接正常")
     else:
-        print("💥 测试失败! 请检查配置")
+        logger.error("💥 测试失败! 请检查配置")
         sys.exit(1)